@@ -51,25 +51,25 @@ enum CardDetailsExtractor {
 
     // MARK: - PAN Extraction
 
+    private static let panRegex = try? NSRegularExpression(pattern: "(?:\\d[\\s-]?){13,19}")
+
     private static func extractPan(from text: String) -> String? {
         let normalizedText = text.replacingOccurrences(of: "\n", with: " ")
-        let pattern = "(?:\\d[\\s-]?){13,19}"
-        guard let regex = try? NSRegularExpression(pattern: pattern) else { return nil }
+        guard let regex = panRegex else { return nil }
 
         var candidates: [PanCandidate] = []
 
         let matches = regex.matches(in: normalizedText, range: NSRange(location: 0, length: normalizedText.utf16.count))
         for match in matches {
             guard let range = Range(match.range, in: normalizedText) else { continue }
-            let raw = String(normalizedText[range])
-            let digits = raw.filter(\.isWholeNumber)
-            guard (13...19).contains(digits.count) else { continue }
+            let digits = CardNumber.asciiDigits(in: normalizedText[range])
+            guard (13...19).contains(digits.utf8.count) else { continue }
 
             let context = contextWindow(around: range, in: normalizedText)
             let hasContext = hasCardContext(in: context)
             let candidate = PanCandidate(
                 value: digits,
-                hasLuhn: isLuhnValid(digits),
+                hasLuhn: CardNumber.isLuhnValid(digits),
                 hasContext: hasContext
             )
 
@@ -107,10 +107,18 @@ enum CardDetailsExtractor {
         return extractStandaloneExpiry(from: text)
     }
 
+    private static let keywordExpiryWithSepRegex = try? NSRegularExpression(
+        pattern: "(?i)(valid|exp|expiry|good\\s*thru)[^\\n]{0,20}(0[1-9]|1[0-2])[\\s/\\-](\\d{2}|\\d{4})"
+    )
+    private static let keywordExpiryNoSepRegex = try? NSRegularExpression(
+        pattern: "(?i)(valid|exp|expiry|good\\s*thru)[^\\n]{0,20}(0[1-9]|1[0-2])(\\d{2})"
+    )
+    // Use negative lookbehind/lookahead to avoid matching parts of longer numbers
+    private static let standaloneExpiryRegex = try? NSRegularExpression(pattern: "(?<!\\d)(0[1-9]|1[0-2])[\\s/\\-](\\d{2})(?!\\d)")
+
     private static func extractExpiryNearKeyword(from text: String) -> String? {
         // Try with separator first (most common)
-        let patternWithSep = "(?i)(valid|exp|expiry|good\\s*thru)[^\\n]{0,20}(0[1-9]|1[0-2])[\\s/\\-](\\d{2}|\\d{4})"
-        if let regex = try? NSRegularExpression(pattern: patternWithSep),
+        if let regex = keywordExpiryWithSepRegex,
            let match = regex.firstMatch(in: text, range: NSRange(location: 0, length: text.utf16.count)),
            match.numberOfRanges >= 4,
            let monthRange = Range(match.range(at: 2), in: text),
@@ -121,8 +129,7 @@ enum CardDetailsExtractor {
         }
 
         // Try without separator (e.g., "Valid 0824")
-        let patternNoSep = "(?i)(valid|exp|expiry|good\\s*thru)[^\\n]{0,20}(0[1-9]|1[0-2])(\\d{2})"
-        if let regex = try? NSRegularExpression(pattern: patternNoSep),
+        if let regex = keywordExpiryNoSepRegex,
            let match = regex.firstMatch(in: text, range: NSRange(location: 0, length: text.utf16.count)),
            match.numberOfRanges >= 4,
            let monthRange = Range(match.range(at: 2), in: text),
@@ -136,9 +143,7 @@ enum CardDetailsExtractor {
     }
 
     private static func extractStandaloneExpiry(from text: String) -> String? {
-        // Use negative lookbehind/lookahead to avoid matching parts of longer numbers
-        let pattern = "(?<!\\d)(0[1-9]|1[0-2])[\\s/\\-](\\d{2})(?!\\d)"
-        guard let regex = try? NSRegularExpression(pattern: pattern) else { return nil }
+        guard let regex = standaloneExpiryRegex else { return nil }
 
         let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
         let candidates = matches.compactMap { match -> String? in
@@ -154,19 +159,21 @@ enum CardDetailsExtractor {
 
     // MARK: - Cardholder Name Extraction
 
-    private static func extractHolderName(from lines: [String], pan: String?, expiry: String?) -> String? {
-        let ignoreTokens = [
+    private static let holderNameIgnoreMatcher = KeywordMatcher<String>(
+        ["ignore": [
             "valid", "exp", "good thru",
             "visa", "mastercard", "american express", "amex", "discover",
             "bank", "www", "http", "https", "bofa", "global"
-        ]
+        ]],
+        caseInsensitive: true
+    )
 
+    private static func extractHolderName(from lines: [String], pan: String?, expiry: String?) -> String? {
         // Find lines that could be names (no digits, not ignored tokens)
         let candidates = lines.enumerated().filter { _, line in
-            let lower = line.lowercased()
-            return !line.isEmpty
+            !line.isEmpty
                 && line.rangeOfCharacter(from: .decimalDigits) == nil
-                && !ignoreTokens.contains(where: { lower.contains($0) })
+                && !holderNameIgnoreMatcher.matchesAny(in: line)
         }
 
         // Prefer lines after PAN or expiry
@@ -184,30 +191,36 @@ enum CardDetailsExtractor {
 
     // MARK: - Issuer Extraction
 
-    private static func extractIssuer(from lines: [String], fullText: String) -> String? {
-        let knownIssuers = [
-            "bank of america", "bofa", "boa",
-            "chase", "wells fargo",
-            "citibank", "citi",
-            "capital one", "hsbc",
-            "american express", "amex",
-            "discover", "us bank",
-            "td", "pnc", "barclays", "santander"
-        ]
+    private static let knownIssuers = [
+        "bank of america", "bofa", "boa",
+        "chase", "wells fargo",
+        "citibank", "citi",
+        "capital one", "hsbc",
+        "american express", "amex",
+        "discover", "us bank",
+        "td", "pnc", "barclays", "santander"
+    ]
+
+    /// Each issuer is its own group so a single caseless scan reports which names appear.
+    private static let issuerMatcher = KeywordMatcher<String>(
+        Dictionary(uniqueKeysWithValues: knownIssuers.map { ($0, [$0]) }),
+        caseInsensitive: true
+    )
+    private static let bankingTermMatcher = KeywordMatcher<String>(
+        ["banking": ["bank", "card services", "financial"]],
+        caseInsensitive: true
+    )
 
+    private static func extractIssuer(from lines: [String], fullText: String) -> String? {
         // Check for known issuers in full text - prefer longer matches
-        let lowerText = fullText.lowercased()
-        let matches = knownIssuers.filter { lowerText.contains($0) }
-        if let longestMatch = matches.max(by: { $0.count < $1.count }) {
+        // Walk the list, not the Set, so ties in length resolve in list order on every launch
+        let matches = issuerMatcher.matches(in: fullText)
+        if let longestMatch = knownIssuers.filter(matches.contains).max(by: { $0.count < $1.count }) {
             return longestMatch.capitalized
         }
 
         // Look for banking-related terms in lines
-        let bankingTerms = ["bank", "card services", "financial"]
-        if let line = lines.first(where: { line in
-            let lower = line.lowercased()
-            return bankingTerms.contains(where: { lower.contains($0) })
-        }) {
+        if let line = lines.first(where: { bankingTermMatcher.matchesAny(in: $0) }) {
             return line
         }
 
@@ -224,9 +237,9 @@ enum CardDetailsExtractor {
 
     private static func candidatePan(from value: String?) -> String? {
         guard let value else { return nil }
-        let digits = value.filter(\.isWholeNumber)
-        guard (13...19).contains(digits.count) else { return nil }
-        return isLuhnValid(digits) ? digits : nil
+        let digits = CardNumber.asciiDigits(in: value)
+        guard (13...19).contains(digits.utf8.count) else { return nil }
+        return CardNumber.isLuhnValid(digits) ? digits : nil
     }
 
     static func normalizeExpiry(_ raw: String) -> String {
@@ -263,20 +276,6 @@ enum CardDetailsExtractor {
         }
     }
 
-    private static func isLuhnValid(_ digits: String) -> Bool {
-        let reversed = digits.reversed().compactMap { Int(String($0)) }
-        let sum = reversed.enumerated().reduce(0) { sum, pair in
-            let (index, digit) = pair
-            if index % 2 == 1 {
-                let doubled = digit * 2
-                return sum + (doubled > 9 ? doubled - 9 : doubled)
-            } else {
-                return sum + digit
-            }
-        }
-        return sum % 10 == 0
-    }
-
     private static func canonicalKey(_ key: String) -> String {
         let normalized = key
             .trimmingCharacters(in: .whitespacesAndNewlines)
@@ -301,9 +300,12 @@ enum CardDetailsExtractor {
         return String(text[lowerBound..<upperBound]).lowercased()
     }
 
+    private static let cardContextMatcher = KeywordMatcher<String>(
+        ["context": ["valid", "exp", "thru", "card", "debit", "credit", "cvv", "ccv", "valid thru", "good thru"]]
+    )
+
     private static func hasCardContext(in context: String) -> Bool {
-        let keywords = ["valid", "exp", "thru", "card", "debit", "credit", "cvv", "ccv", "valid thru", "good thru"]
-        return keywords.contains { context.contains($0) }
+        cardContextMatcher.matchesAny(in: context)
     }
 
     private static func score(for candidate: PanCandidate) -> Int {
@@ -0,0 +1,31 @@
+//
+//  CardNumber.swift
+//  FolioMind
+//
+//  Card number checks shared by the card extractor and the document classifier.
+//
+
+import Foundation
+
+enum CardNumber {
+    /// Keeps only ASCII digits, working on UTF-8 bytes rather than `Character`s.
+    static func asciiDigits<S: StringProtocol>(in text: S) -> String {
+        String(decoding: text.utf8.filter { $0 &- 0x30 < 10 }, as: UTF8.self)
+    }
+
+    /// Luhn doubling with the "subtract 9" step folded in, indexed by digit.
+    private static let luhnDoubled = [0, 2, 4, 6, 8, 1, 3, 5, 7, 9]
+
+    static func isLuhnValid(_ digits: String) -> Bool {
+        var sum = 0
+        var doubles = false
+        // Walk ASCII digit bytes right to left; anything else is skipped
+        for byte in digits.utf8.reversed() {
+            let value = Int(byte &- 0x30)
+            guard value < 10 else { continue }
+            sum += doubles ? luhnDoubled[value] : value
+            doubles.toggle()
+        }
+        return sum % 10 == 0
+    }
+}
@@ -6,6 +6,7 @@
 //  Improved with promotional detection and strengthened rules to prevent false positives.
 //
 
+import CryptoKit
 import Foundation
 
 struct DocumentTypeClassifier {
@@ -17,117 +18,323 @@ struct DocumentTypeClassifier {
         hinted: DocumentType?,
         defaultType: DocumentType = .generic
     ) -> DocumentType {
-        let text = ocrText.lowercased()
-        let fieldKeys = fields.map { $0.key.lowercased() }
-        let fieldValues = fields.map { $0.value.lowercased() }
-        let haystack = (text + " " + fieldValues.joined(separator: " ")).lowercased()
+        classify(
+            ocrText: ocrText,
+            fieldKeys: fields.map(\.key),
+            fieldValues: fields.map(\.value),
+            defaultType: defaultType
+        )
+    }
 
-        // CRITICAL: Check in this specific order
-        // Promotional must be checked FIRST to prevent false positives
+    /// Same as `classify`, but runs the rule engine off the caller's actor so long OCR text
+    /// doesn't block the main thread. Field keys and values are copied out first so the
+    /// SwiftData models never leave the caller's actor.
+    static func classifyInBackground(
+        ocrText: String,
+        fields: [Field],
+        hinted: DocumentType?,
+        defaultType: DocumentType = .generic
+    ) async -> DocumentType {
+        let fieldKeys = fields.map(\.key)
+        let fieldValues = fields.map(\.value)
+        return await Task.detached(priority: .userInitiated) {
+            DocumentTypeClassifier.classify(
+                ocrText: ocrText,
+                fieldKeys: fieldKeys,
+                fieldValues: fieldValues,
+                defaultType: defaultType
+            )
+        }.value
+    }
 
-        // 1. Promotional (check EARLY to prevent false positives)
-        let promotionalHit = isPromotional(text: haystack)
+    /// SHA-256 of the OCR text, field values and keys (unit-separated), so lookups hash the strings in
+    /// place instead of concatenating them, and the cache holds digests rather than document copies.
+    private static func decisionCacheKey(ocrText: String, fieldKeys: [String], fieldValues: [String]) -> NSString {
+        var hasher = SHA256()
+        var text = ocrText
+        // Hash the string's own UTF-8 storage rather than copying it into a `Data`
+        text.withUTF8 { hasher.update(bufferPointer: UnsafeRawBufferPointer($0)) }
+        for var part in fieldValues + fieldKeys {
+            hasher.update(data: Data([0x1F]))
+            part.withUTF8 { hasher.update(bufferPointer: UnsafeRawBufferPointer($0)) }
+        }
+        let hex = hasher.finalize().map { String(format: "%02x", $0) }.joined()
+        return hex as NSString
+    }
 
-        // 2. High-specificity types (strong unique patterns)
-        let insuranceHit = isInsuranceCard(text: haystack, fields: fieldKeys)
-        let creditHit = isCreditCard(
-            text: haystack,
-            fieldValues: fieldValues,
-            fieldKeys: fieldKeys
-        )
+    private static func classify(
+        ocrText: String,
+        fieldKeys: [String],
+        fieldValues: [String],
+        defaultType: DocumentType
+    ) -> DocumentType {
+        // The same text is classified several times per capture (preliminary, post-extraction,
+        // merge, ingest); only the first call runs the detectors
+        let cacheKey = decisionCacheKey(ocrText: ocrText, fieldKeys: fieldKeys, fieldValues: fieldValues)
+        if let cached = decisionCache.object(forKey: cacheKey) {
+            return cached.type ?? defaultType
+        }
 
-        // 3. Transactional types (require structure)
-        let receiptHit = isReceipt(
-            text: haystack,
-            fieldKeys: fieldKeys,
-            isPromotional: promotionalHit
-        )
-        let billHit = isBillStatement(text: haystack)
-
-        // 4. Generic types (weaker signals)
-        let letterHit = isLetter(text: haystack, isPromotional: promotionalHit)
-
-        // PRIORITY ORDER (order matters!)
-        let result: DocumentType
-        if promotionalHit {
-            result = .promotional
-        } else if insuranceHit {
-            result = .insuranceCard
-        } else if creditHit {
-            result = .creditCard
-        } else if receiptHit {
-            result = .receipt
-        } else if billHit {
-            result = .billStatement
-        } else if letterHit {
-            result = .letter
+        // No lowercasing pass: the keyword matcher folds ASCII case while scanning, and the
+        // regexes below only look at digits and separators
+        let haystack = makeHaystack(ocrText: ocrText, fieldValues: fieldValues)
+
+        // Single pass over the haystack; every detector below reads from this set
+        let hits = keywordMatcher.matches(in: haystack)
+
+        // CRITICAL: Check in this specific order
+        // 1. Promotional (check EARLY to prevent false positives)
+        // 2. High-specificity types (strong unique patterns): insurance, credit card
+        // 3. Transactional types (require structure): receipt, bill
+        // 4. Generic types (weaker signals): letter
+        // Detectors stop at the first hit, so the text-scanning ones (credit card, receipt)
+        // never run for documents an earlier rule already claims. Promotional is known to be
+        // false by the time receipt and letter are asked.
+        let detected: DocumentType?
+        if isPromotional(hits: hits) {
+            detected = .promotional
+        } else if isInsuranceCard(hits: hits) {
+            detected = .insuranceCard
+        } else if isCreditCard(text: haystack, hits: hits, fieldValues: fieldValues, fieldKeys: fieldKeys) {
+            detected = .creditCard
+        } else if isReceipt(text: haystack, hits: hits, isPromotional: false) {
+            detected = .receipt
+        } else if isBillStatement(hits: hits) {
+            detected = .billStatement
+        } else if isLetter(hits: hits, isPromotional: false) {
+            detected = .letter
         } else {
-            result = defaultType
+            detected = nil
         }
 
-        let signals = DecisionSignals(
-            promotional: promotionalHit,
-            credit: creditHit,
-            insurance: insuranceHit,
-            receipt: receiptHit,
-            bill: billHit,
-            letter: letterHit
-        )
-
         logDecision(
-            text: text,
+            text: ocrText,
+            haystack: haystack,
+            hits: hits,
             fieldKeys: fieldKeys,
             fieldValues: fieldValues,
-            signals: signals,
-            result: result
+            result: detected ?? defaultType
         )
 
-        return result
+        decisionCache.setObject(CachedDecision(type: detected), forKey: cacheKey)
+        return detected ?? defaultType
     }
 
-    // MARK: - Promotional Detection (NEW)
+    /// `ocrText + " " + fieldValues.joined(separator: " ")`, built into one buffer sized up front
+    /// instead of allocating the joined values and then the concatenation.
+    private static func makeHaystack(ocrText: String, fieldValues: [String]) -> String {
+        var haystack = ""
+        haystack.reserveCapacity(ocrText.utf8.count + fieldValues.reduce(1) { $0 + $1.utf8.count + 1 })
+        haystack += ocrText
+        haystack += " "
+        for (index, value) in fieldValues.enumerated() {
+            if index > 0 {
+                haystack += " "
+            }
+            haystack += value
+        }
+        return haystack
+    }
 
-    /// Detects promotional/marketing content (offers, coupons, advertisements)
-    /// Requires 2+ different signal types to avoid false positives
-    private static func isPromotional(text: String) -> Bool {
+    // MARK: - Decision Cache
+
+    /// Detector outcome for one input; `nil` means no detector fired and the caller's
+    /// `defaultType` applies, so one entry serves callers with different defaults.
+    private final class CachedDecision {
+        let type: DocumentType?
+
+        init(type: DocumentType?) {
+            self.type = type
+        }
+    }
+
+    /// Keyed by OCR text, field values and field keys (everything the detectors read).
+    /// NSCache is thread-safe, which `classifyInBackground` relies on.
+    private static let decisionCache: NSCache<NSString, CachedDecision> = {
+        let cache = NSCache<NSString, CachedDecision>()
+        cache.countLimit = 32
+        return cache
+    }()
+
+    // MARK: - Keyword Groups
+
+    /// Keyword groups consulted by the detectors. All groups are matched in one pass
+    /// over the haystack; detectors then only check group membership.
+    private enum KeywordGroup: Hashable {
+        // Promotional
+        case incentiveVerb, conditional, promoTerm, urgency, callToAction
+        // Receipt
+        case transactionId, receiptCardType, paymentIndicator, cashIndicator
+        case merchantIndicator, receiptKeyword, paymentComplete
+        // Insurance
+        case insuranceAntiPattern, insuranceCardIndicator, insuranceTerm
+        case networkTerm, insurerName, rxBin
+        // Credit card
+        case issuerName, nonPaymentCard
+        // Bill
+        case billingTerm, paymentDue, accountTerm, serviceTerm, invoiceTerm
+        // Letter
+        case salutation, closing
+    }
+
+    private static let keywordMatcher = KeywordMatcher<KeywordGroup>([
         // Future-conditional verbs (offer contingent on action)
-        let incentiveVerbs = [
+        .incentiveVerb: [
             "get $", "earn", "save $", "receive", "win",
             "claim", "redeem"
-        ]
-
+        ],
         // Future/conditional grammar
-        let conditionals = [
+        .conditional: [
             "when you", "if you", "after you",
             "you'll", "we'll", "you will", "you can"
-        ]
-
+        ],
         // Promotional terminology
-        let promoTerms = [
+        .promoTerm: [
             "promo code", "promotional code", "offer code",
             "offer", "promotion", "deal",
             "bonus", "reward", "free", "gift"
-        ]
-
+        ],
         // Urgency/scarcity
-        let urgency = [
+        .urgency: [
             "limited time", "expires", "ends", "by ",
             "hurry", "act now", "don't miss", "last chance"
-        ]
-
+        ],
         // Call-to-action
-        let ctas = [
+        .callToAction: [
             "sign up", "enroll", "apply now", "join now",
             "visit", "call now", "click here", "register"
+        ],
+
+        // Transaction identifiers
+        .transactionId: [
+            "receipt #", "receipt#", "receipt number", "receipt no",
+            "transaction #", "transaction number", "transaction id",
+            "order #", "order number", "order id",
+            "confirmation #"
+        ],
+        // Payment methods
+        .receiptCardType: [
+            "visa", "mastercard", "amex", "american express",
+            "discover", "maestro", "jcb", "diners"
+        ],
+        .paymentIndicator: [
+            "auth code", "authorization", "approval code",
+            "paid with", "payment method", "card type"
+        ],
+        // Cash payment indicators
+        .cashIndicator: [
+            "cash", "change:", "change due", "tendered",
+            "amount paid", "paid in cash", "cash tendered"
+        ],
+        // Merchant context
+        .merchantIndicator: [
+            "store #", "cashier", "terminal", "register",
+            "server:", "table:", "pump:", "merchant id"
+        ],
+        .receiptKeyword: [
+            "receipt", "thank you for shopping",
+            "customer copy", "merchant copy"
+        ],
+        .paymentComplete: [
+            "tendered", "change:", "change due"
+        ],
+
+        // Not an insurance card even if insurance terms appear
+        .insuranceAntiPattern: [
+            "this is not an insurance card",
+            "summary of benefits", "coverage summary",
+            "explanation of benefits", "eob",
+            "claim statement", "billing statement"
+        ],
+        // Card-specific identifiers
+        .insuranceCardIndicator: [
+            "member id", "member number", "subscriber id",
+            "policy number", "policy #", "certificate number"
+        ],
+        // Insurance-specific terminology
+        .insuranceTerm: [
+            "copay", "co-pay", "deductible",
+            "rx bin", "rxbin", "rx grp", "rxgrp", "rx pcn",
+            "payer id", "provider network"
+        ],
+        // Network/plan types
+        .networkTerm: [
+            "ppo", "hmo", "epo", "pos",
+            "dental plan", "vision plan", "health plan"
+        ],
+        // Insurance company names (strong signal)
+        .insurerName: [
+            "blue cross", "blue shield", "premera", "regence",
+            "aetna", "cigna", "united healthcare", "kaiser",
+            "anthem", "humana", "delta dental", "vsp"
+        ],
+        .rxBin: ["rx bin", "rxbin"],
+
+        // Card context indicators
+        .issuerName: [
+            "visa", "mastercard", "american express", "amex",
+            "discover", "unionpay", "maestro", "diners", "jcb"
+        ],
+        // Not a payment card
+        .nonPaymentCard: [
+            "gift card", "member card", "membership card",
+            "rewards card", "loyalty card", "id card"
+        ],
+
+        // Strong billing-specific terms
+        .billingTerm: [
+            "billing statement", "statement of account",
+            "billing period", "statement date",
+            "service period"
+        ],
+        // Payment request language
+        .paymentDue: [
+            "amount due", "total due", "balance due",
+            "minimum payment", "payment due date",
+            "please pay", "remit payment"
+        ],
+        // Account management
+        .accountTerm: [
+            "account number", "account #",
+            "previous balance", "current charges",
+            "account summary", "new balance"
+        ],
+        // Service-specific (utilities, medical, etc.)
+        .serviceTerm: [
+            "utility bill", "electric service", "gas service",
+            "water service", "internet service",
+            "usage", "kwh", "therms", "gallons",
+            "medical bill", "hospital bill", "patient statement"
+        ],
+        // Invoice patterns
+        .invoiceTerm: [
+            "invoice number", "invoice #", "invoice date"
+        ],
+
+        // Salutations
+        .salutation: [
+            "dear ", "to whom it may concern",
+            "hello ", "hi ", "greetings"
+        ],
+        // Closings
+        .closing: [
+            "sincerely", "regards", "best regards",
+            "yours truly", "respectfully", "cordially",
+            "with appreciation", "warm regards"
         ]
+    ], caseInsensitive: true)
 
+    // MARK: - Promotional Detection (NEW)
+
+    private static let promotionalSignalGroups: [KeywordGroup] = [
+        .incentiveVerb, .conditional, .promoTerm, .urgency, .callToAction
+    ]
+
+    /// Detects promotional/marketing content (offers, coupons, advertisements)
+    /// Requires 2+ different signal types to avoid false positives
+    private static func isPromotional(hits: Set<KeywordGroup>) -> Bool {
         // Count distinct signal types
-        var signalTypes = 0
-        if incentiveVerbs.contains(where: { text.contains($0) }) { signalTypes += 1 }
-        if conditionals.contains(where: { text.contains($0) }) { signalTypes += 1 }
-        if promoTerms.contains(where: { text.contains($0) }) { signalTypes += 1 }
-        if urgency.contains(where: { text.contains($0) }) { signalTypes += 1 }
-        if ctas.contains(where: { text.contains($0) }) { signalTypes += 1 }
+        let signalTypes = promotionalSignalGroups.reduce(0) { $0 + (hits.contains($1) ? 1 : 0) }
 
         // Require at least 2 different promotional signal types
         return signalTypes >= 2
@@ -139,7 +346,7 @@ struct DocumentTypeClassifier {
     /// Strengthened to require transaction structure and prevent promotional misclassification
     private static func isReceipt(
         text: String,
-        fieldKeys: [String],
+        hits: Set<KeywordGroup>,
         isPromotional: Bool
     ) -> Bool {
         // ANTI-PATTERN: If promotional, cannot be receipt
@@ -149,40 +356,14 @@ struct DocumentTypeClassifier {
 
         // STRONG TRANSACTION INDICATORS
 
-        // Transaction identifiers
-        let transactionPatterns = [
-            "receipt #", "receipt#", "receipt number", "receipt no",
-            "transaction #", "transaction number", "transaction id",
-            "order #", "order number", "order id",
-            "confirmation #"
-        ]
-        let hasTransactionId = transactionPatterns.contains { text.contains($0) }
+        let hasTransactionId = hits.contains(.transactionId)
 
-        // Payment methods
-        let cardTypes = ["visa", "mastercard", "amex", "american express",
-                        "discover", "maestro", "jcb", "diners"]
-        let paymentIndicators = [
-            "auth code", "authorization", "approval code",
-            "paid with", "payment method", "card type"
-        ]
-        let hasCardPayment = cardTypes.contains { text.contains($0) } ||
-                            paymentIndicators.contains { text.contains($0) }
-
-        // Cash payment indicators
-        let cashIndicators = [
-            "cash", "change:", "change due", "tendered",
-            "amount paid", "paid in cash", "cash tendered"
-        ]
-        let hasCashPayment = cashIndicators.contains { text.contains($0) }
+        let hasCardPayment = hits.contains(.receiptCardType) || hits.contains(.paymentIndicator)
+        let hasCashPayment = hits.contains(.cashIndicator)
 
         let hasPaymentMethod = hasCardPayment || hasCashPayment
 
-        // Merchant context
-        let merchantIndicators = [
-            "store #", "cashier", "terminal", "register",
-            "server:", "table:", "pump:", "merchant id"
-        ]
-        let hasMerchantContext = merchantIndicators.contains { text.contains($0) }
+        let hasMerchantContext = hits.contains(.merchantIndicator)
 
         // CLASSIFICATION RULES (tiered by confidence)
 
@@ -197,21 +378,11 @@ struct DocumentTypeClassifier {
         }
 
         // Rule 3: WEAK - Requires multiple signals
-        let receiptKeywords = [
-            "receipt", "thank you for shopping",
-            "customer copy", "merchant copy"
-        ]
-        let hasReceiptWord = receiptKeywords.contains { text.contains($0) }
+        let hasReceiptWord = hits.contains(.receiptKeyword)
+        let hasPaymentComplete = hits.contains(.paymentComplete)
 
-        let paymentCompleteWords = [
-            "tendered", "change:", "change due"
-        ]
-        let hasPaymentComplete = paymentCompleteWords.contains { text.contains($0) }
-
-        let amountCount = countAmounts(in: text)
-        let hasMultipleAmounts = amountCount >= 3
-
-        if hasReceiptWord && hasPaymentComplete && hasMultipleAmounts {
+        // Counting amounts is a full regex pass; only pay for it when the keywords already agree
+        if hasReceiptWord && hasPaymentComplete && countAmounts(in: text) >= 3 {
             return true
         }
 
@@ -223,54 +394,22 @@ struct DocumentTypeClassifier {
 
     /// Detects insurance cards (health, dental, vision)
     /// Strengthened to require multiple signals and filter out EOB/summaries
-    private static func isInsuranceCard(text: String, fields: [String]) -> Bool {
+    private static func isInsuranceCard(hits: Set<KeywordGroup>) -> Bool {
         // ANTI-PATTERNS (check first)
-        let antiPatterns = [
-            "this is not an insurance card",
-            "summary of benefits", "coverage summary",
-            "explanation of benefits", "eob",
-            "claim statement", "billing statement"
-        ]
-        if antiPatterns.contains(where: { text.contains($0) }) {
+        if hits.contains(.insuranceAntiPattern) {
             return false
         }
 
         // SIGNAL CATEGORIES
-
-        // Card-specific identifiers
-        let cardIndicators = [
-            "member id", "member number", "subscriber id",
-            "policy number", "policy #", "certificate number"
-        ]
-        let hasCardIndicator = cardIndicators.contains { text.contains($0) }
-
-        // Insurance-specific terminology
-        let insuranceTerms = [
-            "copay", "co-pay", "deductible",
-            "rx bin", "rxbin", "rx grp", "rxgrp", "rx pcn",
-            "payer id", "provider network"
-        ]
-        let hasInsuranceTerm = insuranceTerms.contains { text.contains($0) }
-
-        // Network/plan types
-        let networkTerms = [
-            "ppo", "hmo", "epo", "pos",
-            "dental plan", "vision plan", "health plan"
-        ]
-        let hasNetworkTerm = networkTerms.contains { text.contains($0) }
-
-        // Insurance company names (strong signal)
-        let insurers = [
-            "blue cross", "blue shield", "premera", "regence",
-            "aetna", "cigna", "united healthcare", "kaiser",
-            "anthem", "humana", "delta dental", "vsp"
-        ]
-        let hasInsurerName = insurers.contains { text.contains($0) }
+        let hasCardIndicator = hits.contains(.insuranceCardIndicator)
+        let hasInsuranceTerm = hits.contains(.insuranceTerm)
+        let hasNetworkTerm = hits.contains(.networkTerm)
+        let hasInsurerName = hits.contains(.insurerName)
 
         // CLASSIFICATION RULES
 
         // Rule 1: RX info is very specific to insurance cards
-        if text.contains("rx bin") || text.contains("rxbin") {
+        if hits.contains(.rxBin) {
             return true
         }
 
@@ -291,54 +430,60 @@ struct DocumentTypeClassifier {
 
     // MARK: - Credit Card Detection (IMPROVED)
 
+    private enum CardFieldKeyToken: Hashable {
+        case card, number, pan, credit, debit
+    }
+
+    /// Tokens looked for in field keys; one pass per key instead of a `contains` per token.
+    private static let cardFieldKeyMatcher = KeywordMatcher<CardFieldKeyToken>([
+        .card: ["card"],
+        .number: ["number"],
+        .pan: ["pan"],
+        .credit: ["credit"],
+        .debit: ["debit"]
+    ], caseInsensitive: true)
+
     /// Detects physical payment cards (credit/debit)
     /// Improved to filter out gift cards and membership cards
     private static func isCreditCard(
         text: String,
+        hits: Set<KeywordGroup>,
         fieldValues: [String],
         fieldKeys: [String]
     ) -> Bool {
-        // PAN candidates
-        let valueCandidates = fieldValues.flatMap { panCandidates(in: $0) }
-        let textCandidates = panCandidates(in: text)
-        let allCandidates = (textCandidates + valueCandidates)
+        // Both rules below need a 13+ digit PAN candidate. `text` already includes the field
+        // values, so without 13 digits in it there is nothing for the regexes to find.
+        guard containsDigits(atLeast: 13, in: text) else {
+            return false
+        }
 
-        let hasValidPan = allCandidates.contains { isLikelyPAN($0) }
-        let hasLongNumber = allCandidates.contains { (13...19).contains($0.count) }
+        // PAN candidates: stop scanning at the first Luhn-valid one
+        var hasValidPan = false
+        var hasLongNumber = false
+        for source in [text] + fieldValues where !hasValidPan {
+            forEachPanCandidate(in: source) { digits in
+                hasLongNumber = true
+                hasValidPan = CardNumber.isLuhnValid(digits)
+                return hasValidPan
+            }
+        }
 
         // Card context indicators
-        let issuerNames = [
-            "visa", "mastercard", "american express", "amex",
-            "discover", "unionpay", "maestro", "diners", "jcb"
-        ]
-        let hasIssuerName = issuerNames.contains { text.contains($0) }
+        let hasIssuerName = hits.contains(.issuerName)
 
-        let cardTypeKeywords = [
-            "credit card", "debit card", "payment card",
-            "debit", "credit", "valid thru", "exp", "expires"
-        ]
-        let hasCardTypeKeyword = cardTypeKeywords.contains { text.contains($0) }
-
-        let hasExpiry = hasExpiryPattern(in: text) ||
-                       fieldValues.contains { hasExpiryPattern(in: $0) }
+        // `text` is the haystack, which already contains every field value, and the expiry
+        // pattern is unanchored, so scanning the values again could never add a match
+        let hasExpiry = hasExpiryPattern(in: text)
 
-        // Field key patterns (more specific)
-        let cardFieldKeys = fieldKeys.filter { key in
-            (key.contains("card") && key.contains("number")) ||
-            key.contains("pan") ||
-            (key.contains("credit") && key.contains("card")) ||
-            (key.contains("debit") && key.contains("card"))
+        // Field key patterns (more specific): card number, PAN, credit card, debit card
+        let hasCardField = fieldKeys.contains { key in
+            let tokens = cardFieldKeyMatcher.matches(in: key)
+            return tokens.contains(.pan) ||
+                (tokens.contains(.card) && !tokens.isDisjoint(with: [.number, .credit, .debit]))
         }
-        let hasCardField = !cardFieldKeys.isEmpty
 
         // ANTI-PATTERNS (not a payment card)
-        let nonPaymentCardTerms = [
-            "gift card", "member card", "membership card",
-            "rewards card", "loyalty card", "id card"
-        ]
-        let isNonPaymentCard = nonPaymentCardTerms.contains { text.contains($0) }
-
-        if isNonPaymentCard && !hasIssuerName {
+        if hits.contains(.nonPaymentCard) && !hasIssuerName {
             return false  // Gift/membership cards excluded unless issuer name present
         }
 
@@ -363,65 +508,28 @@ struct DocumentTypeClassifier {
 
     /// Detects bill statements (utilities, medical, credit card statements)
     /// Strengthened to require combination of signals
-    private static func isBillStatement(text: String) -> Bool {
-        // Strong billing-specific terms
-        let billingTerms = [
-            "billing statement", "statement of account",
-            "billing period", "statement date",
-            "service period"
-        ]
-        let hasBillingTerm = billingTerms.contains { text.contains($0) }
-
-        // Payment request language
-        let paymentDue = [
-            "amount due", "total due", "balance due",
-            "minimum payment", "payment due date",
-            "please pay", "remit payment"
-        ]
-        let hasPaymentDue = paymentDue.contains { text.contains($0) }
-
-        // Account management
-        let accountTerms = [
-            "account number", "account #",
-            "previous balance", "current charges",
-            "account summary", "new balance"
-        ]
-        let hasAccountTerm = accountTerms.contains { text.contains($0) }
-
-        // Service-specific (utilities, medical, etc.)
-        let serviceTerms = [
-            "utility bill", "electric service", "gas service",
-            "water service", "internet service",
-            "usage", "kwh", "therms", "gallons",
-            "medical bill", "hospital bill", "patient statement"
-        ]
-        let hasServiceTerm = serviceTerms.contains { text.contains($0) }
-
-        // Invoice patterns
-        let invoiceTerms = [
-            "invoice number", "invoice #", "invoice date"
-        ]
-        let hasInvoice = invoiceTerms.contains { text.contains($0) }
+    private static func isBillStatement(hits: Set<KeywordGroup>) -> Bool {
+        let hasPaymentDue = hits.contains(.paymentDue)
 
         // CLASSIFICATION RULES
 
         // Rule 1: Very specific billing terminology
-        if hasBillingTerm {
+        if hits.contains(.billingTerm) {
             return true
         }
 
         // Rule 2: Invoice + payment request
-        if hasInvoice && hasPaymentDue {
+        if hits.contains(.invoiceTerm) && hasPaymentDue {
             return true
         }
 
         // Rule 3: Service-specific + payment request
-        if hasServiceTerm && hasPaymentDue {
+        if hits.contains(.serviceTerm) && hasPaymentDue {
             return true
         }
 
         // Rule 4: Account management + payment request
-        if hasAccountTerm && hasPaymentDue {
+        if hits.contains(.accountTerm) && hasPaymentDue {
             return true
         }
 
@@ -433,109 +541,113 @@ struct DocumentTypeClassifier {
 
     /// Detects personal/business correspondence
     /// Improved to defer to promotional when marketing content detected
-    private static func isLetter(text: String, isPromotional: Bool) -> Bool {
+    private static func isLetter(hits: Set<KeywordGroup>, isPromotional: Bool) -> Bool {
         // If already identified as promotional, don't classify as letter
         if isPromotional {
             return false
         }
 
-        // Salutations
-        let salutations = [
-            "dear ", "to whom it may concern",
-            "hello ", "hi ", "greetings"
-        ]
-        let hasSalutation = salutations.contains { text.contains($0) }
-
-        // Closings
-        let closings = [
-            "sincerely", "regards", "best regards",
-            "yours truly", "respectfully", "cordially",
-            "with appreciation", "warm regards"
-        ]
-        let hasClosing = closings.contains { text.contains($0) }
-
         // Require BOTH salutation and closing for letter format
-        return hasSalutation && hasClosing
+        return hits.contains(.salutation) && hits.contains(.closing)
     }
 
     // MARK: - Helper Functions
 
+    // Compiled once; NSRegularExpression is immutable and safe to share across threads
+    private static let amountRegex = try? NSRegularExpression(
+        pattern: "\\$?\\s?\\d{1,3}(?:,\\d{3})*(?:\\.\\d{2})?"
+    )
+    // Capture digit sequences allowing spaces or dashes, then strip separators.
+    private static let panRegex = try? NSRegularExpression(pattern: "(?:\\d[\\s-]?){13,19}")
+    private static let expiryRegex = try? NSRegularExpression(pattern: "(0[1-9]|1[0-2])[\\s/\\-]?(\\d{2}|\\d{4})")
+
     private static func countAmounts(in text: String) -> Int {
-        let pattern = "\\$?\\s?\\d{1,3}(?:,\\d{3})*(?:\\.\\d{2})?"
-        let regex = try? NSRegularExpression(pattern: pattern, options: [])
-        return regex?.matches(in: text, options: [], range: NSRange(location: 0, length: text.utf16.count)).count ?? 0
+        amountRegex?.numberOfMatches(in: text, options: [], range: NSRange(location: 0, length: text.utf16.count)) ?? 0
     }
 
-    private static func panCandidates(in text: String) -> [String] {
-        // Capture digit sequences allowing spaces or dashes, then strip separators.
-        let pattern = "(?:\\d[\\s-]?){13,19}"
-        let regex = try? NSRegularExpression(pattern: pattern, options: [])
-        let matches = regex?.matches(in: text, options: [], range: NSRange(location: 0, length: text.utf16.count)) ?? []
-        return matches.compactMap { match in
-            guard let range = Range(match.range, in: text) else { return nil }
-            let raw = String(text[range])
-            let digitsOnly = raw.filter(\.isWholeNumber)
-            return digitsOnly
+    /// Calls `body` with the digits of each 13-19 digit PAN-shaped run in `text`
+    /// until it returns `true`.
+    private static func forEachPanCandidate(in text: String, _ body: (String) -> Bool) {
+        guard let panRegex else { return }
+        panRegex.enumerateMatches(in: text, options: [], range: NSRange(location: 0, length: text.utf16.count)) { match, _, stop in
+            guard let match, let range = Range(match.range, in: text) else { return }
+            let digits = CardNumber.asciiDigits(in: text[range])
+            guard (13...19).contains(digits.utf8.count) else { return }
+            if body(digits) {
+                stop.pointee = true
+            }
         }
     }
 
-    private static func isLikelyPAN(_ digits: String) -> Bool {
-        let cleaned = digits.filter(\.isWholeNumber)
-        guard (13...19).contains(cleaned.count) else { return false }
-        return luhnValid(cleaned)
+    /// Cheap prefilter: counts ASCII digit bytes, stopping once `count` is reached.
+    private static func containsDigits(atLeast count: Int, in text: String) -> Bool {
+        var seen = 0
+        for byte in text.utf8 where byte &- 0x30 < 10 {
+            seen += 1
+            if seen >= count {
+                return true
+            }
+        }
+        return false
     }
 
     private static func hasExpiryPattern(in text: String) -> Bool {
-        let pattern = "(0[1-9]|1[0-2])[\\s/\\-]?(\\d{2}|\\d{4})"
-        return text.range(of: pattern, options: .regularExpression) != nil
-    }
-
-    private static func luhnValid(_ digits: String) -> Bool {
-        var sum = 0
-        let reversed = digits.reversed().map { Int(String($0)) ?? 0 }
-        for (index, value) in reversed.enumerated() {
-            if index % 2 == 1 {
-                let doubled = value * 2
-                sum += doubled > 9 ? doubled - 9 : doubled
-            } else {
-                sum += value
-            }
-        }
-        return sum % 10 == 0
+        expiryRegex?.firstMatch(in: text, options: [], range: NSRange(location: 0, length: text.utf16.count)) != nil
     }
 
     // MARK: - Logging
 
-    private struct DecisionSignals {
-        let promotional: Bool
-        let credit: Bool
-        let insurance: Bool
-        let receipt: Bool
-        let bill: Bool
-        let letter: Bool
+    /// One bit per detector, in priority order.
+    private struct DecisionSignals: OptionSet {
+        let rawValue: UInt8
+
+        static let promotional = DecisionSignals(rawValue: 1 << 0)
+        static let insurance = DecisionSignals(rawValue: 1 << 1)
+        static let credit = DecisionSignals(rawValue: 1 << 2)
+        static let receipt = DecisionSignals(rawValue: 1 << 3)
+        static let bill = DecisionSignals(rawValue: 1 << 4)
+        static let letter = DecisionSignals(rawValue: 1 << 5)
     }
 
+    /// Debug-only: re-runs every detector so the log shows the full signal grid,
+    /// not just the one that decided the result.
     private static func logDecision(
         text: String,
+        haystack: String,
+        hits: Set<KeywordGroup>,
         fieldKeys: [String],
         fieldValues: [String],
-        signals: DecisionSignals,
         result: DocumentType
     ) {
 #if DEBUG
         guard debugLoggingEnabled else { return }
-        let candidates = panCandidates(in: text) + fieldValues.flatMap { panCandidates(in: $0) }
-        let luhnValids = candidates.filter { isLikelyPAN($0) }
+        let promotional = isPromotional(hits: hits)
+        var signals: DecisionSignals = []
+        if promotional { signals.insert(.promotional) }
+        if isInsuranceCard(hits: hits) { signals.insert(.insurance) }
+        if isCreditCard(text: haystack, hits: hits, fieldValues: fieldValues, fieldKeys: fieldKeys) { signals.insert(.credit) }
+        if isReceipt(text: haystack, hits: hits, isPromotional: promotional) { signals.insert(.receipt) }
+        if isBillStatement(hits: hits) { signals.insert(.bill) }
+        if isLetter(hits: hits, isPromotional: promotional) { signals.insert(.letter) }
+        var candidateCount = 0
+        var luhnValidCount = 0
+        for source in [text] + fieldValues {
+            forEachPanCandidate(in: source) { digits in
+                candidateCount += 1
+                if CardNumber.isLuhnValid(digits) { luhnValidCount += 1 }
+                return false
+            }
+        }
         let summary = """
         [Classifier] result=\(result.rawValue)
-          promotional=\(signals.promotional)
-          insurance=\(signals.insurance)
-          credit=\(signals.credit)
-          receipt=\(signals.receipt)
-          bill=\(signals.bill)
-          letter=\(signals.letter)
+          promotional=\(signals.contains(.promotional))
+          insurance=\(signals.contains(.insurance))
+          credit=\(signals.contains(.credit))
+          receipt=\(signals.contains(.receipt))
+          bill=\(signals.contains(.bill))
+          letter=\(signals.contains(.letter))
           fieldKeys=\(fieldKeys.prefix(5))
-          luhnValid=\(luhnValids.count) candidates=\(candidates.count)
+          luhnValid=\(luhnValidCount) candidates=\(candidateCount)
           expiryMatch=\(hasExpiryPattern(in: text))
           textPreview=\(text.prefix(100))...
         """
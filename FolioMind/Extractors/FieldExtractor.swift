@@ -8,81 +8,82 @@
 import Foundation
 
 enum FieldExtractor {
+    /// A pattern match before it becomes a `Field`. `Field` is a SwiftData model, so models are
+    /// only created for the candidates that survive deduplication.
+    private struct Candidate {
+        let key: String
+        let value: String
+        let confidence: Double
+    }
+
     /// Extract structured fields from OCR text
     static func extractFields(from ocrText: String) -> [Field] {
-        var fields: [Field] = []
+        var candidates: [Candidate] = []
 
         // Extract phone numbers
-        fields.append(contentsOf: extractPhoneNumbers(from: ocrText))
+        candidates.append(contentsOf: extractPhoneNumbers(from: ocrText))
 
         // Extract emails
-        fields.append(contentsOf: extractEmails(from: ocrText))
+        candidates.append(contentsOf: extractEmails(from: ocrText))
 
         // Extract URLs
-        fields.append(contentsOf: extractURLs(from: ocrText))
+        candidates.append(contentsOf: extractURLs(from: ocrText))
 
         // Extract dates
-        fields.append(contentsOf: extractDates(from: ocrText))
+        candidates.append(contentsOf: extractDates(from: ocrText))
 
         // Extract addresses
-        fields.append(contentsOf: extractAddresses(from: ocrText))
+        candidates.append(contentsOf: extractAddresses(from: ocrText))
 
         // Extract amounts/currency
-        fields.append(contentsOf: extractAmounts(from: ocrText))
+        candidates.append(contentsOf: extractAmounts(from: ocrText))
 
         // Extract names (heuristic-based)
-        fields.append(contentsOf: extractNames(from: ocrText))
+        candidates.append(contentsOf: extractNames(from: ocrText))
 
-        // Final deduplication pass across all field types
-        return deduplicateFields(fields)
+        // Single deduplication pass across all field types
+        return deduplicate(candidates).map { candidate in
+            Field(key: candidate.key, value: candidate.value, confidence: candidate.confidence, source: .vision)
+        }
     }
 
     // MARK: - Phone Number Extraction
 
-    static func extractPhoneNumbers(from text: String) -> [Field] {
-        var fields: [Field] = []
-
-        // Multiple phone number patterns
-        let patterns = [
-            // US formats: (123) 456-7890, 123-456-7890, 123.456.7890
-            "\\(?\\d{3}\\)?[\\s.-]?\\d{3}[\\s.-]?\\d{4}",
-            // International: +1 123 456 7890, +44 20 1234 5678
-            "\\+\\d{1,3}[\\s.-]?\\(?\\d{1,4}\\)?[\\s.-]?\\d{1,4}[\\s.-]?\\d{1,9}",
-            // Compact: 1234567890 (10+ digits)
-            "\\b\\d{10,15}\\b"
-        ]
-
-        for pattern in patterns {
-            if let regex = try? NSRegularExpression(pattern: pattern) {
-                let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
-                for match in matches {
-                    if let range = Range(match.range, in: text) {
-                        let phoneNumber = String(text[range])
-
-                        // Validate it looks like a phone number
-                        let digits = phoneNumber.filter { $0.isNumber }
-                        if digits.count >= 10 && digits.count <= 15 {
-                            // Skip numbers that are likely group/policy identifiers
-                            if hasBannedPhoneContext(in: text, range: range) {
-                                continue
-                            }
-
-                            // Check context for confidence boost
-                            let confidence = phoneContextConfidence(phoneNumber, in: text, range: range)
-
-                            fields.append(Field(
-                                key: "phone_number",
-                                value: phoneNumber.trimmingCharacters(in: .whitespaces),
-                                confidence: confidence,
-                                source: .vision
-                            ))
+    // The system phone-number detector validates candidates against real numbering formats, so it
+    // rejects receipt line numbers and dates that a plain digit pattern would accept
+    private static let phoneDetector = try? NSDataDetector(types: NSTextCheckingResult.CheckingType.phoneNumber.rawValue)
+
+    private static func extractPhoneNumbers(from text: String) -> [Candidate] {
+        var candidates: [Candidate] = []
+
+        if let detector = phoneDetector {
+            let matches = detector.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
+            for match in matches {
+                if let range = Range(match.range, in: text) {
+                    let phoneNumber = String(text[range])
+
+                    // Validate it looks like a phone number
+                    let digits = phoneNumber.filter { $0.isNumber }
+                    if digits.count >= 10 && digits.count <= 15 {
+                        // Skip numbers that are likely group/policy identifiers
+                        if hasBannedPhoneContext(in: text, range: range) {
+                            continue
                         }
+
+                        // Check context for confidence boost
+                        let confidence = phoneContextConfidence(phoneNumber, in: text, range: range)
+
+                        candidates.append(Candidate(
+                            key: "phone_number",
+                            value: phoneNumber.trimmingCharacters(in: .whitespaces),
+                            confidence: confidence
+                        ))
                     }
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     private static func phoneContextConfidence(_ number: String, in text: String, range: Range<String.Index>) -> Double {
@@ -123,96 +124,92 @@ enum FieldExtractor {
 
     // MARK: - Email Extraction
 
-    static func extractEmails(from text: String) -> [Field] {
-        var fields: [Field] = []
+    private static let emailRegex = try? NSRegularExpression(pattern: "[A-Z0-9a-z._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,64}")
+
+    private static func extractEmails(from text: String) -> [Candidate] {
+        guard text.contains("@") else { return [] }
+        var candidates: [Candidate] = []
 
-        let pattern = "[A-Z0-9a-z._%+-]+@[A-Za-z0-9.-]+\\.[A-Za-z]{2,64}"
-        if let regex = try? NSRegularExpression(pattern: pattern) {
+        if let regex = emailRegex {
             let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
             for match in matches {
                 if let range = Range(match.range, in: text) {
                     let email = String(text[range])
-                    fields.append(Field(
+                    candidates.append(Candidate(
                         key: "email",
                         value: email,
-                        confidence: 0.9,
-                        source: .vision
+                        confidence: 0.9
                     ))
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     // MARK: - URL Extraction
 
-    static func extractURLs(from text: String) -> [Field] {
-        var fields: [Field] = []
-
-        let patterns = [
-            "https?://[\\w.-]+(?:\\.[a-zA-Z]{2,})+(?:/[^\\s]*)?",
-            "www\\.[\\w.-]+(?:\\.[a-zA-Z]{2,})+(?:/[^\\s]*)?"
-        ]
-
-        for pattern in patterns {
-            if let regex = try? NSRegularExpression(pattern: pattern) {
-                let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
-                for match in matches {
-                    if let range = Range(match.range, in: text) {
-                        let url = String(text[range])
-                        fields.append(Field(
-                            key: "website",
-                            value: url,
-                            confidence: 0.85,
-                            source: .vision
-                        ))
-                    }
+    private static let urlRegex = alternation(of: [
+        "https?://[\\w.-]+(?:\\.[a-zA-Z]{2,})+(?:/[^\\s]*)?",
+        "www\\.[\\w.-]+(?:\\.[a-zA-Z]{2,})+(?:/[^\\s]*)?"
+    ])
+
+    private static func extractURLs(from text: String) -> [Candidate] {
+        guard text.contains("http") || text.contains("www.") else { return [] }
+        var candidates: [Candidate] = []
+
+        if let regex = urlRegex {
+            let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
+            for match in matches {
+                if let range = Range(match.range, in: text) {
+                    let url = String(text[range])
+                    candidates.append(Candidate(
+                        key: "website",
+                        value: url,
+                        confidence: 0.85
+                    ))
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     // MARK: - Date Extraction
 
-    static func extractDates(from text: String) -> [Field] {
-        var fields: [Field] = []
-
-        let patterns = [
-            // MM/DD/YYYY, MM-DD-YYYY
-            "\\b(?:0?[1-9]|1[0-2])[/-](?:0?[1-9]|[12][0-9]|3[01])[/-](?:19|20)?\\d{2}\\b",
-            // Month DD, YYYY
-            "\\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|"
-                + "Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\\s+\\d{1,2},?\\s+\\d{4}\\b",
-            // DD Month YYYY
-            "\\b\\d{1,2}\\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|"
-                + "Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\\s+\\d{4}\\b"
-        ]
-
-        for pattern in patterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive) {
-                let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
-                for match in matches {
-                    if let range = Range(match.range, in: text) {
-                        let date = String(text[range])
-
-                        // Determine if it's a due date, effective date, etc.
-                        let key = dateContextKey(date, in: text, range: range)
-
-                        fields.append(Field(
-                            key: key,
-                            value: date,
-                            confidence: 0.8,
-                            source: .vision
-                        ))
-                    }
+    private static let dateRegex = alternation(of: [
+        // MM/DD/YYYY, MM-DD-YYYY
+        "\\b(?:0?[1-9]|1[0-2])[/-](?:0?[1-9]|[12][0-9]|3[01])[/-](?:19|20)?\\d{2}\\b",
+        // Month DD, YYYY
+        "\\b(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|"
+            + "Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\\s+\\d{1,2},?\\s+\\d{4}\\b",
+        // DD Month YYYY
+        "\\b\\d{1,2}\\s+(?:Jan(?:uary)?|Feb(?:ruary)?|Mar(?:ch)?|Apr(?:il)?|May|Jun(?:e)?|Jul(?:y)?|Aug(?:ust)?|"
+            + "Sep(?:tember)?|Oct(?:ober)?|Nov(?:ember)?|Dec(?:ember)?)\\s+\\d{4}\\b"
+    ], options: .caseInsensitive)
+
+    private static func extractDates(from text: String) -> [Candidate] {
+        var candidates: [Candidate] = []
+
+        if let regex = dateRegex {
+            let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
+            for match in matches {
+                if let range = Range(match.range, in: text) {
+                    let date = String(text[range])
+
+                    // Determine if it's a due date, effective date, etc.
+                    let key = dateContextKey(date, in: text, range: range)
+
+                    candidates.append(Candidate(
+                        key: key,
+                        value: date,
+                        confidence: 0.8
+                    ))
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     private static func dateContextKey(_ date: String, in text: String, range: Range<String.Index>) -> String {
@@ -239,48 +236,46 @@ enum FieldExtractor {
 
     // MARK: - Address Extraction
 
-    static func extractAddresses(from text: String) -> [Field] {
-        var fields: [Field] = []
-
+    private static let addressRegexes: [NSRegularExpression] = [
         // Multi-line address pattern: street, city, state zip
-        let streetPattern =
-            "\\d+\\s+[A-Za-z0-9\\s,.]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Circle|Cir|Way)"
-            + "[^\\n]*(?:\\n|,)[^\\n]+,\\s*[A-Z]{2}\\s+\\d{5}(?:-\\d{4})?"
-        let poBoxPattern = "P\\s*O\\.?\\s*Box\\s+\\d+[\\s\\n,]+[A-Za-z\\s]+[\\s\\n,]+[A-Z]{2}\\s+\\d{5}(?:-\\d{4})?(?:\\s+\\d{4})?"
-
-        let patterns = [streetPattern, poBoxPattern]
-
-        for pattern in patterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive) {
-                let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
-                for match in matches {
-                    if let range = Range(match.range, in: text) {
-                        let address = String(text[range])
-                            .replacingOccurrences(of: "\n", with: ", ")
-                            .trimmingCharacters(in: .whitespacesAndNewlines)
-
-                        fields.append(Field(
-                            key: "address",
-                            value: address,
-                            confidence: 0.75,
-                            source: .vision
-                        ))
-                    }
+        "\\d+\\s+[A-Za-z0-9\\s,.]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr|Court|Ct|Circle|Cir|Way)"
+            + "[^\\n]*(?:\\n|,)[^\\n]+,\\s*[A-Z]{2}\\s+\\d{5}(?:-\\d{4})?",
+        // PO Box, city, state zip
+        "P\\s*O\\.?\\s*Box\\s+\\d+[\\s\\n,]+[A-Za-z\\s]+[\\s\\n,]+[A-Z]{2}\\s+\\d{5}(?:-\\d{4})?(?:\\s+\\d{4})?"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+
+    private static func extractAddresses(from text: String) -> [Candidate] {
+        var candidates: [Candidate] = []
+
+        for regex in addressRegexes {
+            let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
+            for match in matches {
+                if let range = Range(match.range, in: text) {
+                    let address = String(text[range])
+                        .replacingOccurrences(of: "\n", with: ", ")
+                        .trimmingCharacters(in: .whitespacesAndNewlines)
+
+                    candidates.append(Candidate(
+                        key: "address",
+                        value: address,
+                        confidence: 0.75
+                    ))
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     // MARK: - Amount/Currency Extraction
 
-    static func extractAmounts(from text: String) -> [Field] {
-        var fields: [Field] = []
+    private static let amountRegex = try? NSRegularExpression(pattern: "\\$\\s*\\d{1,3}(?:,\\d{3})*(?:\\.\\d{2})?")
 
-        let pattern = "\\$\\s*\\d{1,3}(?:,\\d{3})*(?:\\.\\d{2})?"
+    private static func extractAmounts(from text: String) -> [Candidate] {
+        guard text.contains("$") else { return [] }
+        var candidates: [Candidate] = []
 
-        if let regex = try? NSRegularExpression(pattern: pattern) {
+        if let regex = amountRegex {
             let matches = regex.matches(in: text, range: NSRange(location: 0, length: text.utf16.count))
             for match in matches {
                 if let range = Range(match.range, in: text) {
@@ -289,17 +284,16 @@ enum FieldExtractor {
                     // Determine context (balance, due, total, etc.)
                     let key = amountContextKey(amount, in: text, range: range)
 
-                    fields.append(Field(
+                    candidates.append(Candidate(
                         key: key,
                         value: amount,
-                        confidence: 0.85,
-                        source: .vision
+                        confidence: 0.85
                     ))
                 }
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     private static func amountContextKey(_ amount: String, in text: String, range: Range<String.Index>) -> String {
@@ -326,8 +320,13 @@ enum FieldExtractor {
 
     // MARK: - Name Extraction
 
-    static func extractNames(from text: String) -> [Field] {
-        var fields: [Field] = []
+    private static func extractNames(from text: String) -> [Candidate] {
+        // Name context is a property of the whole text, not of any one line, so check it once up front
+        let nameKeywords = ["name", "member", "patient", "cardholder", "insured", "holder"]
+        let lowercasedText = text.lowercased()
+        guard nameKeywords.contains(where: { lowercasedText.contains($0) }) else { return [] }
+
+        var candidates: [Candidate] = []
         let lines = text.components(separatedBy: .newlines)
 
         for line in lines {
@@ -347,47 +346,42 @@ enum FieldExtractor {
             }
 
             if allTitleCase {
-                // Look for name context
-                let nameKeywords = ["name", "member", "patient", "cardholder", "insured", "holder"]
-
-                // Check if this line or nearby text suggests it's a name
-                let linesContext = lines.joined(separator: " ").lowercased()
-                let hasNameContext = nameKeywords.contains(where: { linesContext.contains($0) })
-
-                if hasNameContext {
-                    fields.append(Field(
-                        key: "name",
-                        value: trimmed,
-                        confidence: 0.7,
-                        source: .vision
-                    ))
-                }
+                candidates.append(Candidate(
+                    key: "name",
+                    value: trimmed,
+                    confidence: 0.7
+                ))
             }
         }
 
-        return deduplicateFields(fields)
+        return candidates
     }
 
     // MARK: - Utilities
 
-    private static func deduplicateFields(_ fields: [Field]) -> [Field] {
+    /// Compiles several patterns into one regex so a single pass over the text finds matches for all of them.
+    private static func alternation(of patterns: [String], options: NSRegularExpression.Options = []) -> NSRegularExpression? {
+        try? NSRegularExpression(pattern: patterns.map { "(?:\($0))" }.joined(separator: "|"), options: options)
+    }
+
+    private static func deduplicate(_ candidates: [Candidate]) -> [Candidate] {
         var seen = Set<String>()
-        var unique: [Field] = []
+        var unique: [Candidate] = []
 
-        for field in fields {
+        for candidate in candidates {
             // Normalize the value for comparison
             let normalizedValue: String
-            if field.key.lowercased().contains("phone") {
+            if candidate.key.lowercased().contains("phone") {
                 // For phone numbers, normalize by removing all non-digit characters except +
-                normalizedValue = field.value.filter { $0.isNumber || $0 == "+" }
+                normalizedValue = candidate.value.filter { $0.isNumber || $0 == "+" }
             } else {
-                normalizedValue = field.value
+                normalizedValue = candidate.value
             }
 
-            let key = "\(field.key):\(normalizedValue)"
+            let key = "\(candidate.key):\(normalizedValue)"
             if !seen.contains(key) {
                 seen.insert(key)
-                unique.append(field)
+                unique.append(candidate)
             }
         }
 
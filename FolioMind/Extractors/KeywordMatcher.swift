@@ -0,0 +1,140 @@
+//
+//  KeywordMatcher.swift
+//  FolioMind
+//
+//  Multi-pattern keyword matcher (Aho-Corasick) shared by the heuristic extractors.
+//
+
+import Foundation
+
+/// Matches a fixed set of grouped keywords against text in a single linear pass.
+/// Build once (e.g. as a `static let`) and reuse; scanning reports which groups had at least one hit.
+///
+/// The automaton is compiled into a dense transition table over byte classes, so scanning is one
+/// table lookup per byte with no failure-link chasing. Supports up to 64 groups.
+struct KeywordMatcher<Group: Hashable> {
+    private let groups: [Group]
+    private let fullMask: UInt64
+    /// Maps every byte to its class; bytes that appear in no keyword share class 0.
+    private let byteClasses: [Int]
+    private let classCount: Int
+    /// `table[state * classCount + class]` is the next state.
+    private let table: [Int32]
+    /// Bitmask of groups matched on reaching each state (including matches inherited via failure links).
+    private let outputMasks: [UInt64]
+
+    /// - Parameter caseInsensitive: Fold ASCII letters while building and scanning so callers
+    ///   can pass raw text instead of lowercasing it first.
+    init(_ keywordsByGroup: [Group: [String]], caseInsensitive: Bool = false) {
+        let fold: (UInt8) -> UInt8 = { byte in
+            caseInsensitive && byte >= 0x41 && byte <= 0x5A ? byte | 0x20 : byte
+        }
+
+        // 1. Trie over (folded) keyword bytes
+        var groups: [Group] = []
+        var trie: [[UInt8: Int]] = [[:]]
+        var masks: [UInt64] = [0]
+        for (group, keywords) in keywordsByGroup {
+            let nonEmpty = keywords.filter { !$0.isEmpty }
+            guard !nonEmpty.isEmpty else { continue }
+            precondition(groups.count < 64, "KeywordMatcher supports at most 64 groups")
+            let bit = UInt64(1) << UInt64(groups.count)
+            groups.append(group)
+
+            for keyword in nonEmpty {
+                var state = 0
+                for byte in keyword.utf8.map(fold) {
+                    if let next = trie[state][byte] {
+                        state = next
+                    } else {
+                        trie.append([:])
+                        masks.append(0)
+                        let next = trie.count - 1
+                        trie[state][byte] = next
+                        state = next
+                    }
+                }
+                masks[state] |= bit
+            }
+        }
+
+        // 2. Byte classes keep the table narrow: one column per distinct keyword byte plus "other"
+        var byteClasses = [Int](repeating: 0, count: 256)
+        var classCount = 1
+        for byte in Set(trie.flatMap { $0.keys }).sorted() {
+            byteClasses[Int(byte)] = classCount
+            classCount += 1
+        }
+        if caseInsensitive {
+            for upper in UInt8(0x41)...UInt8(0x5A) {
+                byteClasses[Int(upper)] = byteClasses[Int(upper | 0x20)]
+            }
+        }
+
+        // 3. Dense DFA, filled breadth-first so a state's failure row is always complete before it is copied
+        var table = [Int32](repeating: 0, count: trie.count * classCount)
+        var failure = [Int](repeating: 0, count: trie.count)
+        var queue: [Int] = []
+        for (byte, next) in trie[0] {
+            table[byteClasses[Int(byte)]] = Int32(next)
+            queue.append(next)
+        }
+        var head = 0
+        while head < queue.count {
+            let state = queue[head]
+            head += 1
+            let row = state * classCount
+            let fallbackRow = failure[state] * classCount
+            for cls in 0..<classCount {
+                table[row + cls] = table[fallbackRow + cls]
+            }
+            for (byte, next) in trie[state] {
+                let cls = byteClasses[Int(byte)]
+                failure[next] = Int(table[fallbackRow + cls])
+                masks[next] |= masks[failure[next]]
+                table[row + cls] = Int32(next)
+                queue.append(next)
+            }
+        }
+
+        self.groups = groups
+        self.fullMask = groups.isEmpty ? 0 : UInt64.max >> UInt64(64 - groups.count)
+        self.byteClasses = byteClasses
+        self.classCount = classCount
+        self.table = table
+        self.outputMasks = masks
+    }
+
+    /// Returns every group with at least one keyword occurring in `text`.
+    /// Without `caseInsensitive`, keywords are matched byte-for-byte, so callers pass already-lowercased text.
+    func matches(in text: String) -> Set<Group> {
+        var mask: UInt64 = 0
+        var state = 0
+        for byte in text.utf8 {
+            state = Int(table[state &* classCount &+ byteClasses[Int(byte)]])
+            mask |= outputMasks[state]
+            // Each group only needs to match once; stop as soon as nothing is left to find
+            if mask == fullMask {
+                break
+            }
+        }
+
+        var hits = Set<Group>()
+        for (index, group) in groups.enumerated() where mask & (UInt64(1) << UInt64(index)) != 0 {
+            hits.insert(group)
+        }
+        return hits
+    }
+
+    /// Returns `true` as soon as any keyword from any group occurs in `text`.
+    func matchesAny(in text: String) -> Bool {
+        var state = 0
+        for byte in text.utf8 {
+            state = Int(table[state &* classCount &+ byteClasses[Int(byte)]])
+            if outputMasks[state] != 0 {
+                return true
+            }
+        }
+        return false
+    }
+}
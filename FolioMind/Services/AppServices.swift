@@ -885,17 +885,13 @@ final class DocumentStore {
         }
 
         // Local/on-device processing path: run full analysis inline
-        var analyses: [DocumentAnalysisResult] = []
-        for url in persistentURLs {
-            let analysis = try await analyzer.analyze(imageURL: url, hints: options.hints)
-            analyses.append(analysis)
-        }
+        let analyses = try await analyzePages(persistentURLs, hints: options.hints)
 
         let combinedOCR = analyses.map(\.ocrText).joined(separator: "\n\n")
         let combinedFields = analyses.flatMap(\.fields)
         let combinedFaces = analyses.flatMap(\.faceClusters)
         let faceIDs = combinedFaces.map { $0.id }
-        let docType = DocumentTypeClassifier.classify(
+        let docType = await DocumentTypeClassifier.classifyInBackground(
             ocrText: combinedOCR,
             fields: combinedFields,
             hinted: options.hints?.suggestedType ?? analyses.first?.docType,
@@ -975,17 +971,13 @@ final class DocumentStore {
             document.lastProcessingError = nil
 
             do {
-                var analyses: [DocumentAnalysisResult] = []
-                for url in assetURLs {
-                    let analysis = try await analyzer.analyze(imageURL: url, hints: options.hints)
-                    analyses.append(analysis)
-                }
+                let analyses = try await analyzePages(assetURLs, hints: options.hints)
 
                 let combinedOCR = analyses.map(\.ocrText).joined(separator: "\n\n")
                 let combinedFields = analyses.flatMap(\.fields)
                 let combinedFaces = analyses.flatMap(\.faceClusters)
                 let faceIDs = combinedFaces.map { $0.id }
-                let docType = DocumentTypeClassifier.classify(
+                let docType = await DocumentTypeClassifier.classifyInBackground(
                     ocrText: combinedOCR,
                     fields: combinedFields,
                     hinted: options.hints?.suggestedType ?? analyses.first?.docType,
@@ -1055,6 +1047,39 @@ final class DocumentStore {
         }
     }
 
+    // MARK: - Page Analysis
+
+    /// Upper bound on pages analyzed at once, so large scans don't flood the backend with uploads.
+    private static let maxConcurrentPageAnalyses = 3
+
+    /// Analyze pages concurrently (bounded by `maxConcurrentPageAnalyses`) and return results in page order.
+    private func analyzePages(_ urls: [URL], hints: DocumentHints?) async throws -> [DocumentAnalysisResult] {
+        let analyzer = self.analyzer
+        return try await withThrowingTaskGroup(of: (Int, DocumentAnalysisResult).self) { group in
+            var results = [DocumentAnalysisResult?](repeating: nil, count: urls.count)
+            var nextIndex = 0
+
+            while nextIndex < min(Self.maxConcurrentPageAnalyses, urls.count) {
+                let index = nextIndex
+                let url = urls[index]
+                group.addTask { (index, try await analyzer.analyze(imageURL: url, hints: hints)) }
+                nextIndex += 1
+            }
+
+            while let finished = try await group.next() {
+                results[finished.0] = finished.1
+                if nextIndex < urls.count {
+                    let index = nextIndex
+                    let url = urls[index]
+                    group.addTask { (index, try await analyzer.analyze(imageURL: url, hints: hints)) }
+                    nextIndex += 1
+                }
+            }
+
+            return results.compactMap { $0 }
+        }
+    }
+
     // MARK: - Asset Persistence
 
     private func cleanedLocation(_ location: String?) -> String? {
@@ -6,6 +6,7 @@
 //  Replaces on-device LLM processing with cloud-based BAML service.
 //
 
+import CryptoKit
 import Foundation
 
 // MARK: - API Models
@@ -17,7 +18,8 @@ struct ClassificationSignals: Codable {
     let insuranceCard: Bool
     let creditCard: Bool
     let letter: Bool
-    let details: [String: AnyCodable]?
+    // The backend also returns a per-detector `details` object. The app never reads it, so it is
+    // deliberately not declared here and the decoder skips it instead of walking it value by value.
     let keyPhrases: [String]?
     let indicators: [String]?
     let counterIndicators: [String]?
@@ -27,7 +29,7 @@ struct ClassificationSignals: Codable {
         case promotional, receipt, bill
         case insuranceCard = "insurance_card"
         case creditCard = "credit_card"
-        case letter, details
+        case letter
         case keyPhrases = "key_phrases"
         case indicators
         case counterIndicators = "counter_indicators"
@@ -123,55 +125,6 @@ struct UploadResponseWithMetadata: Codable {
     }
 }
 
-// MARK: - Helper for dynamic JSON
-
-struct AnyCodable: Codable {
-    let value: Any
-
-    init(_ value: Any) {
-        self.value = value
-    }
-
-    init(from decoder: Decoder) throws {
-        let container = try decoder.singleValueContainer()
-        if let bool = try? container.decode(Bool.self) {
-            value = bool
-        } else if let int = try? container.decode(Int.self) {
-            value = int
-        } else if let double = try? container.decode(Double.self) {
-            value = double
-        } else if let string = try? container.decode(String.self) {
-            value = string
-        } else if let array = try? container.decode([AnyCodable].self) {
-            value = array.map { $0.value }
-        } else if let dict = try? container.decode([String: AnyCodable].self) {
-            value = dict.mapValues { $0.value }
-        } else {
-            value = NSNull()
-        }
-    }
-
-    func encode(to encoder: Encoder) throws {
-        var container = encoder.singleValueContainer()
-        switch value {
-        case let bool as Bool:
-            try container.encode(bool)
-        case let int as Int:
-            try container.encode(int)
-        case let double as Double:
-            try container.encode(double)
-        case let string as String:
-            try container.encode(string)
-        case let array as [Any]:
-            try container.encode(array.map { AnyCodable($0) })
-        case let dict as [String: Any]:
-            try container.encode(dict.mapValues { AnyCodable($0) })
-        default:
-            try container.encodeNil()
-        }
-    }
-}
-
 // MARK: - Backend API Service
 
 final class BackendAPIService {
@@ -199,11 +152,61 @@ final class BackendAPIService {
                 return "Authentication required to access this feature"
             }
         }
+
+        /// Rate limiting (429) and unavailability (503): the server turned the request away without
+        /// processing it, so resending is safe even for uploads. Timeouts and other 5xx are not retried
+        /// here, since the server may already be running (and billing) the OCR/transcription job.
+        var isTransient: Bool {
+            switch self {
+            case .httpError(let statusCode, _):
+                return statusCode == 429 || statusCode == 503
+            default:
+                return false
+            }
+        }
+    }
+
+    /// Retries after the first attempt for transient failures, and the backoff bounds (seconds).
+    private static let maxTransientRetries = 2
+    private static let baseBackoffDelay: Double = 1.0
+    private static let maxBackoffDelay: Double = 30.0
+
+    /// Shared coders; both are configured once and reused for every request/response.
+    private static let encoder = JSONEncoder()
+    private static let decoder = JSONDecoder()
+
+    /// Size of each read when copying a file into a multipart body.
+    private static let uploadChunkSize = 1 << 20
+
+    /// Content types for uploaded files, keyed by lowercased path extension.
+    private static let mimeTypes: [String: String] = [
+        "jpg": "image/jpeg",
+        "jpeg": "image/jpeg",
+        "png": "image/png",
+        "heic": "image/heic",
+        "m4a": "audio/m4a"
+    ]
+
+    /// Box so decoded responses of any type can live in an `NSCache`.
+    private final class CachedResponse {
+        let value: Any
+
+        init(_ value: Any) {
+            self.value = value
+        }
     }
 
     private let baseURL: String
     private let session: URLSession
     private let tokenManager: TokenManager?
+    /// Classification/extraction results keyed by a hash of endpoint + request body, so re-analyzing
+    /// identical OCR text (retries, re-extraction) doesn't hit the backend again. Image/audio uploads
+    /// are keyed by a hash of the file contents, so re-submitting the same file skips OCR/transcription.
+    private let responseCache: NSCache<NSString, CachedResponse> = {
+        let cache = NSCache<NSString, CachedResponse>()
+        cache.countLimit = 128
+        return cache
+    }()
 
     init(baseURL: String = "https://foliomind-backend.fly.dev", session: URLSession = .shared, tokenManager: TokenManager? = nil) {
         if baseURL.hasSuffix("/") {
@@ -238,7 +241,7 @@ final class BackendAPIService {
             hint: hint?.toBackendString()
         )
 
-        return try await post(url: url, body: request)
+        return try await post(url: url, body: request, cacheable: true)
     }
 
     /// Extract fields from a document
@@ -252,7 +255,7 @@ final class BackendAPIService {
             documentType: documentType.toBackendString()
         )
 
-        return try await post(url: url, body: request)
+        return try await post(url: url, body: request, cacheable: true)
     }
 
     /// Perform full document analysis (classify + extract)
@@ -266,7 +269,7 @@ final class BackendAPIService {
             hint: hint?.toBackendString()
         )
 
-        return try await post(url: url, body: request)
+        return try await post(url: url, body: request, cacheable: true)
     }
 
     /// Upload image for OCR, classification, and extraction
@@ -275,24 +278,15 @@ final class BackendAPIService {
             throw APIError.invalidURL
         }
 
-        let imageData = try Data(contentsOf: imageURL)
         let fileName = imageURL.lastPathComponent.isEmpty ? "image.jpg" : imageURL.lastPathComponent
 
-        let mimeType: String
-        switch imageURL.pathExtension.lowercased() {
-        case "jpg", "jpeg":
-            mimeType = "image/jpeg"
-        case "png":
-            mimeType = "image/png"
-        case "heic":
-            mimeType = "image/heic"
-        default:
-            mimeType = "image/jpeg"
-        }
+        let mimeType = Self.mimeTypes[imageURL.pathExtension.lowercased()] ?? "image/jpeg"
 
-        return try await uploadImageFile(
+        // Send under both "file" and "image" keys to be robust to backend expectations.
+        return try await uploadFile(
             url: url,
-            fileData: imageData,
+            fileURL: imageURL,
+            fieldNames: ["file", "image"],
             fileName: fileName,
             mimeType: mimeType
         )
@@ -309,122 +303,168 @@ final class BackendAPIService {
             throw APIError.invalidURL
         }
 
-        let audioData = try Data(contentsOf: audioURL)
         let fileName = audioURL.lastPathComponent
-        let mimeType = "audio/m4a"
+        let mimeType = Self.mimeTypes[audioURL.pathExtension.lowercased()] ?? "audio/m4a"
 
-        return try await uploadFile(url: url, fileData: audioData, fileName: fileName, mimeType: mimeType)
+        return try await uploadFile(
+            url: url,
+            fileURL: audioURL,
+            fieldNames: ["file"],
+            fileName: fileName,
+            mimeType: mimeType
+        )
     }
 
     // MARK: - Private Helper Methods
 
-    private func post<T: Encodable, R: Decodable>(url: URL, body: T) async throws -> R {
+    private func post<T: Encodable, R: Decodable>(url: URL, body: T, cacheable: Bool = false) async throws -> R {
+        let httpBody = try Self.encoder.encode(body)
+        let cacheKey = cacheable ? Self.cacheKey(url: url, body: httpBody) : nil
+        if let cacheKey, let cached = responseCache.object(forKey: cacheKey)?.value as? R {
+            return cached
+        }
+
         var request = URLRequest(url: url)
         request.httpMethod = "POST"
         request.setValue("application/json", forHTTPHeaderField: "Content-Type")
+        await authorize(&request)
 
-        // Add authentication header if available and user is authenticated
-        if let tokenManager = tokenManager {
-            do {
-                let token = try await tokenManager.validAccessToken()
-                request.setValue("Bearer \(token)", forHTTPHeaderField: "Authorization")
-            } catch {
-                // User not authenticated - continue without auth header
-                print("ℹ️ No valid auth token available, making unauthenticated request")
-            }
+        request.httpBody = httpBody
+
+        let response: R = try await performRequest(request)
+        if let cacheKey {
+            responseCache.setObject(CachedResponse(response), forKey: cacheKey)
         }
+        return response
+    }
 
-        let encoder = JSONEncoder()
-        request.httpBody = try encoder.encode(body)
+    /// Add the bearer token when the user is signed in; otherwise the request goes out unauthenticated.
+    private func authorize(_ request: inout URLRequest) async {
+        guard let tokenManager else { return }
+        do {
+            let token = try await tokenManager.validAccessToken()
+            request.setValue("Bearer \(token)", forHTTPHeaderField: "Authorization")
+        } catch {
+#if DEBUG
+            print("ℹ️ No valid auth token available, making unauthenticated request")
+#endif
+        }
+    }
 
-        return try await performRequest(request)
+    private static func cacheKey(url: URL, body: Data) -> NSString {
+        var hasher = SHA256()
+        hasher.update(data: Data(url.absoluteString.utf8))
+        hasher.update(data: body)
+        let hex = hasher.finalize().map { String(format: "%02x", $0) }.joined()
+        return hex as NSString
     }
 
+    /// Multipart upload of a file on disk. The body is assembled in a temporary file and sent with
+    /// `upload(for:fromFile:)`, so the image/audio is never held in memory in full.
     private func uploadFile<R: Decodable>(
         url: URL,
-        fileData: Data,
+        fileURL: URL,
+        fieldNames: [String],
         fileName: String,
         mimeType: String
     ) async throws -> R {
+        // Hash before building the body, so a cache hit costs one read of the file and nothing else
+        let cacheKey = try Self.cacheKey(url: url, fileURL: fileURL)
+        if let cached = responseCache.object(forKey: cacheKey)?.value as? R {
+            return cached
+        }
+
         let boundary = UUID().uuidString
         var request = URLRequest(url: url)
         request.httpMethod = "POST"
         request.setValue("multipart/form-data; boundary=\(boundary)", forHTTPHeaderField: "Content-Type")
+        await authorize(&request)
 
-        // Add authentication header if available and user is authenticated
-        if let tokenManager = tokenManager {
-            do {
-                let token = try await tokenManager.validAccessToken()
-                request.setValue("Bearer \(token)", forHTTPHeaderField: "Authorization")
-            } catch {
-                // User not authenticated - continue without auth header
-                print("ℹ️ No valid auth token available, making unauthenticated request")
-            }
-        }
+        let bodyURL = try writeMultipartBody(
+            from: fileURL,
+            fieldNames: fieldNames,
+            fileName: fileName,
+            mimeType: mimeType,
+            boundary: boundary
+        )
+        defer { try? FileManager.default.removeItem(at: bodyURL) }
 
-        var body = Data()
+        let response: R = try await performRequest(request, bodyFileURL: bodyURL)
+        responseCache.setObject(CachedResponse(response), forKey: cacheKey)
+        return response
+    }
 
-        // Add file data
-        body.append(Data("--\(boundary)\r\n".utf8))
-        body.append(Data("Content-Disposition: form-data; name=\"file\"; filename=\"\(fileName)\"\r\n".utf8))
-        body.append(Data("Content-Type: \(mimeType)\r\n\r\n".utf8))
-        body.append(fileData)
-        body.append(Data("\r\n".utf8))
-        body.append(Data("--\(boundary)--\r\n".utf8))
+    /// Hash of the endpoint (including query options such as language) and the file contents,
+    /// read in chunks so large recordings are never loaded in full.
+    private static func cacheKey(url: URL, fileURL: URL) throws -> NSString {
+        var hasher = SHA256()
+        hasher.update(data: Data(url.absoluteString.utf8))
 
-        request.httpBody = body
+        let input = try FileHandle(forReadingFrom: fileURL)
+        defer { try? input.close() }
+        while let chunk = try input.read(upToCount: uploadChunkSize), !chunk.isEmpty {
+            hasher.update(data: chunk)
+        }
 
-        return try await performRequest(request)
+        let hex = hasher.finalize().map { String(format: "%02x", $0) }.joined()
+        return hex as NSString
     }
 
-    /// Specialized image upload that sends the file under both "file" and "image" field names
-    /// for compatibility with different backend expectations.
-    private func uploadImageFile<R: Decodable>(
-        url: URL,
-        fileData: Data,
+    private func writeMultipartBody(
+        from fileURL: URL,
+        fieldNames: [String],
         fileName: String,
-        mimeType: String
-    ) async throws -> R {
-        let boundary = UUID().uuidString
-        var request = URLRequest(url: url)
-        request.httpMethod = "POST"
-        request.setValue("multipart/form-data; boundary=\(boundary)", forHTTPHeaderField: "Content-Type")
-
-        // Add authentication header if available and user is authenticated
-        if let tokenManager = tokenManager {
-            do {
-                let token = try await tokenManager.validAccessToken()
-                request.setValue("Bearer \(token)", forHTTPHeaderField: "Authorization")
-            } catch {
-                // User not authenticated - continue without auth header
-                print("ℹ️ No valid auth token available, making unauthenticated request")
+        mimeType: String,
+        boundary: String
+    ) throws -> URL {
+        let bodyURL = FileManager.default.temporaryDirectory
+            .appendingPathComponent("upload-\(UUID().uuidString)")
+        FileManager.default.createFile(atPath: bodyURL.path, contents: nil)
+
+        let output = try FileHandle(forWritingTo: bodyURL)
+        defer { try? output.close() }
+
+        // Byte range of the file in the first part; later parts copy it from the body itself,
+        // so the source file is read only once
+        var firstCopy: (offset: UInt64, length: UInt64)?
+        for fieldName in fieldNames {
+            try output.write(contentsOf: Data("--\(boundary)\r\n".utf8))
+            try output.write(contentsOf: Data("Content-Disposition: form-data; name=\"\(fieldName)\"; filename=\"\(fileName)\"\r\n".utf8))
+            try output.write(contentsOf: Data("Content-Type: \(mimeType)\r\n\r\n".utf8))
+
+            if let firstCopy {
+                let input = try FileHandle(forReadingFrom: bodyURL)
+                defer { try? input.close() }
+                try input.seek(toOffset: firstCopy.offset)
+                try Self.copyChunks(from: input, to: output, limit: firstCopy.length)
+            } else {
+                let input = try FileHandle(forReadingFrom: fileURL)
+                defer { try? input.close() }
+                let start = try output.offset()
+                try Self.copyChunks(from: input, to: output)
+                firstCopy = (start, try output.offset() - start)
             }
+            try output.write(contentsOf: Data("\r\n".utf8))
         }
+        try output.write(contentsOf: Data("--\(boundary)--\r\n".utf8))
 
-        var body = Data()
+        return bodyURL
+    }
 
-        func appendPart(fieldName: String) {
-            body.append(Data("--\(boundary)\r\n".utf8))
-            body.append(Data("Content-Disposition: form-data; name=\"\(fieldName)\"; filename=\"\(fileName)\"\r\n".utf8))
-            body.append(Data("Content-Type: \(mimeType)\r\n\r\n".utf8))
-            body.append(fileData)
-            body.append(Data("\r\n".utf8))
+    /// Copies `input` to `output` in upload-sized chunks, stopping after `limit` bytes when one is given.
+    private static func copyChunks(from input: FileHandle, to output: FileHandle, limit: UInt64 = .max) throws {
+        var remaining = limit
+        while remaining > 0,
+              let chunk = try input.read(upToCount: Int(min(UInt64(uploadChunkSize), remaining))),
+              !chunk.isEmpty {
+            try output.write(contentsOf: chunk)
+            remaining -= UInt64(chunk.count)
         }
-
-        // Send under both "file" and "image" keys to be robust to backend expectations.
-        appendPart(fieldName: "file")
-        appendPart(fieldName: "image")
-
-        body.append(Data("--\(boundary)--\r\n".utf8))
-
-        request.httpBody = body
-
-        return try await performRequest(request)
     }
 
-    private func performRequest<R: Decodable>(_ request: URLRequest) async throws -> R {
-        // Try the request
-        let result: Result<R, APIError> = await performRequestOnce(request)
+    private func performRequest<R: Decodable>(_ request: URLRequest, bodyFileURL: URL? = nil) async throws -> R {
+        // Try the request (transient failures are retried with backoff)
+        let result: Result<R, APIError> = await performRequestWithBackoff(request, bodyFileURL: bodyFileURL)
 
         switch result {
         case .success(let decoded):
@@ -437,7 +477,9 @@ final class BackendAPIService {
             if case .httpError(statusCode: 401, _) = error,
                let tokenManager = tokenManager,
                request.value(forHTTPHeaderField: "Authorization") != nil {
+#if DEBUG
                 print("🔄 Got 401, attempting to refresh token and retry...")
+#endif
 
                 // Refresh the token
                 do {
@@ -447,22 +489,31 @@ final class BackendAPIService {
                     var retryRequest = request
                     retryRequest.setValue("Bearer \(newToken)", forHTTPHeaderField: "Authorization")
 
-                    let retryResult: Result<R, APIError> = await performRequestOnce(retryRequest)
+                    let retryResult: Result<R, APIError> = await performRequestWithBackoff(
+                        retryRequest,
+                        bodyFileURL: bodyFileURL
+                    )
                     switch retryResult {
                     case .success(let decoded):
+#if DEBUG
                         print("✅ Retry successful after token refresh")
+#endif
                         return decoded
                     case .failure(let retryError):
                         // If retry also fails, throw the retry error
                         throw retryError
                     }
-                } catch let authError as AuthError {
-                    // If token refresh itself failed, throw authentication required
-                    print("❌ Token refresh failed: \(authError.localizedDescription)")
-                    throw APIError.authenticationRequired
                 } catch {
-                    // For other errors during refresh, just rethrow
-                    print("❌ Error during token refresh: \(error.localizedDescription)")
+                    // If token refresh itself failed, throw authentication required;
+                    // for other errors during refresh, just rethrow
+                    let refreshFailed = error is AuthError
+#if DEBUG
+                    let prefix = refreshFailed ? "Token refresh failed" : "Error during token refresh"
+                    print("❌ \(prefix): \(error.localizedDescription)")
+#endif
+                    if refreshFailed {
+                        throw APIError.authenticationRequired
+                    }
                     throw error
                 }
             }
@@ -472,43 +523,89 @@ final class BackendAPIService {
         }
     }
 
-    private func performRequestOnce<R: Decodable>(_ request: URLRequest) async -> Result<R, APIError> {
-        var responseData: Data?
+    /// Retries 429/503 responses, waiting for the server's `Retry-After` when it sends one and otherwise
+    /// backing off exponentially with jitter. Other failures are left to the caller's own retry policy.
+    private func performRequestWithBackoff<R: Decodable>(
+        _ request: URLRequest,
+        bodyFileURL: URL?
+    ) async -> Result<R, APIError> {
+        var attempt = 0
+        while true {
+            let (result, retryAfter): (Result<R, APIError>, TimeInterval?) = await performRequestOnce(
+                request,
+                bodyFileURL: bodyFileURL
+            )
+            guard case .failure(let error) = result,
+                  error.isTransient,
+                  attempt < Self.maxTransientRetries,
+                  !Task.isCancelled else {
+                return result
+            }
 
+            let backoff = min(Self.maxBackoffDelay, Self.baseBackoffDelay * pow(2, Double(attempt)))
+            let delay = retryAfter.map { min(Self.maxBackoffDelay, $0) } ?? backoff * Double.random(in: 0.5...1.0)
+            attempt += 1
+#if DEBUG
+            print("⏳ Transient error (\(error.localizedDescription)), retrying in \(String(format: "%.1f", delay))s...")
+#endif
+            try? await Task.sleep(nanoseconds: UInt64(delay * 1_000_000_000))
+        }
+    }
+
+    private func send(_ request: URLRequest, bodyFileURL: URL?) async throws -> (Data, URLResponse) {
+        if let bodyFileURL {
+            return try await session.upload(for: request, fromFile: bodyFileURL)
+        }
+        return try await session.data(for: request)
+    }
+
+    /// Sends the request once. Alongside the result, returns the `Retry-After` delay (in seconds) of an
+    /// unsuccessful HTTP response, if the server sent one.
+    private func performRequestOnce<R: Decodable>(
+        _ request: URLRequest,
+        bodyFileURL: URL?
+    ) async -> (Result<R, APIError>, retryAfter: TimeInterval?) {
+        let data: Data
+        let response: URLResponse
         do {
-            let (data, response) = try await session.data(for: request)
-            responseData = data
+            (data, response) = try await send(request, bodyFileURL: bodyFileURL)
+        } catch {
+            return (.failure(.networkError(error)), nil)
+        }
 
-            guard let httpResponse = response as? HTTPURLResponse else {
-                return .failure(.invalidResponse)
-            }
+        guard let httpResponse = response as? HTTPURLResponse else {
+            return (.failure(.invalidResponse), nil)
+        }
 
-            guard (200...299).contains(httpResponse.statusCode) else {
-                let message = String(data: data, encoding: .utf8)
-                print("❌ HTTP \(httpResponse.statusCode): \(message ?? "no response body")")
-                return .failure(.httpError(statusCode: httpResponse.statusCode, message: message))
-            }
+        guard (200...299).contains(httpResponse.statusCode) else {
+            let message = String(data: data, encoding: .utf8)
+#if DEBUG
+            print("❌ HTTP \(httpResponse.statusCode): \(message ?? "no response body")")
+#endif
+            let retryAfter = httpResponse.value(forHTTPHeaderField: "Retry-After").flatMap { TimeInterval($0) }
+            return (.failure(.httpError(statusCode: httpResponse.statusCode, message: message)), retryAfter)
+        }
 
-            // Log response for debugging
-            if let url = request.url?.path, url.contains("audio") {
-                if let jsonString = String(data: data, encoding: .utf8) {
-                    print("📥 Audio upload response (\(data.count) bytes): \(jsonString.prefix(500))")
-                }
-            }
+#if DEBUG
+        // Log response for debugging
+        if let url = request.url?.path, url.contains("audio") {
+            // Only decode the bytes that are printed, not the whole (possibly large) transcript
+            let preview = String(decoding: data.prefix(500), as: UTF8.self)
+            print("📥 Audio upload response (\(data.count) bytes): \(preview)")
+        }
+#endif
 
-            let decoder = JSONDecoder()
-            let decoded = try decoder.decode(R.self, from: data)
-            return .success(decoded)
-        } catch let error as APIError {
-            return .failure(error)
-        } catch let decodingError as DecodingError {
-            print("❌ JSON decoding error: \(decodingError)")
-            if let data = responseData, let jsonString = String(data: data, encoding: .utf8) {
+        do {
+            let decoded = try Self.decoder.decode(R.self, from: data)
+            return (.success(decoded), nil)
+        } catch {
+#if DEBUG
+            print("❌ JSON decoding error: \(error)")
+            if let jsonString = String(data: data, encoding: .utf8) {
                 print("📄 Raw response that failed to decode: \(jsonString)")
             }
-            return .failure(.decodingError(decodingError))
-        } catch {
-            return .failure(.networkError(error))
+#endif
+            return (.failure(.decodingError(error)), nil)
         }
     }
 }
@@ -552,16 +649,17 @@ final class BackendLLMService: LLMService {
         self.apiService = apiService
     }
 
+    /// The analyze endpoint ignores the prompt, so re-prompting returns the same reply.
+    var followsPrompt: Bool { false }
+
     func extract(prompt: String, text: String) async throws -> String {
         // Use the analyze endpoint for general extraction
         let response = try await apiService.analyze(ocrText: text)
 
-        // Convert fields to JSON string format
-        let fields = response.fields.map { field in
-            "\"\(field.key)\": \"\(field.value)\""
-        }.joined(separator: ", ")
-
-        return "{\(fields)}"
+        // Convert fields to a JSON object; the first value wins for repeated keys
+        let fields = Dictionary(response.fields.map { ($0.key, $0.value) }, uniquingKeysWith: { first, _ in first })
+        let data = try JSONSerialization.data(withJSONObject: fields)
+        return String(decoding: data, as: UTF8.self)
     }
 
     func cleanText(_ rawText: String) async throws -> String {
@@ -29,6 +29,15 @@ struct BackendDocumentAnalyzer: DocumentAnalyzer {
     }
 
     func analyze(imageURL: URL, hints: DocumentHints?) async throws -> DocumentAnalysisResult {
+#if DEBUG
+        let startTime = CFAbsoluteTimeGetCurrent()
+#endif
+
+        // Face detection doesn't depend on OCR or the backend; run it alongside them
+        #if canImport(Vision)
+        async let detectedFaces = VisionFaceDetector().detectFaces(at: imageURL)
+        #endif
+
         // Prefer on-device OCR (VisionKit) to speed up backend processing
         let analysisResult: AnalysisData
 
@@ -40,17 +49,29 @@ struct BackendDocumentAnalyzer: DocumentAnalyzer {
             analysisResult = try await analyzeWithOCRText(ocrText, hints: hints)
         } catch {
             guard useBackendOCR else { throw error }
+#if DEBUG
             print("⚠️ Local OCR unavailable or empty (\(error.localizedDescription)), uploading image for backend OCR...")
+#endif
             analysisResult = try await analyzeWithBackendOCR(imageURL: imageURL, hints: hints)
         }
 
         // Detect faces locally
         #if canImport(Vision)
-        let faces = try await VisionFaceDetector().detectFaces(at: imageURL)
+        let faces = try await detectedFaces
         #else
         let faces: [FaceCluster] = []
         #endif
 
+#if DEBUG
+        // One summary line per page instead of a log line per step
+        let elapsedMs = Int((CFAbsoluteTimeGetCurrent() - startTime) * 1000)
+        print(
+            "📄 Analyzed \(imageURL.lastPathComponent): type=\(analysisResult.docType.rawValue) "
+                + "fields=\(analysisResult.fields.count) chars=\(analysisResult.ocrText.utf16.count) "
+                + "faces=\(faces.count) time=\(elapsedMs)ms"
+        )
+#endif
+
         return DocumentAnalysisResult(
             ocrText: analysisResult.ocrText,
             fields: analysisResult.fields,
@@ -82,7 +103,16 @@ struct BackendDocumentAnalyzer: DocumentAnalyzer {
     }
 
     private func analyzeWithBackendOCR(imageURL: URL, hints: DocumentHints?) async throws -> AnalysisData {
-        let response = try await backendService.uploadImage(imageURL)
+        // Backend OCR gains nothing from more than ~2k pixels; send a smaller copy when the original is larger
+        let downscaledURL = await Task.detached(priority: .userInitiated) {
+            ImagePreprocessor.downscaledCopyForUpload(of: imageURL)
+        }.value
+        defer {
+            if let downscaledURL {
+                try? FileManager.default.removeItem(at: downscaledURL)
+            }
+        }
+        let response = try await backendService.uploadImage(downscaledURL ?? imageURL)
 
         return AnalysisData(
             ocrText: response.ocrText ?? "",
@@ -109,16 +139,11 @@ struct BackendDocumentAnalyzer: DocumentAnalyzer {
     }
 
     private func analyzeWithOCRText(_ ocrText: String, hints: DocumentHints?) async throws -> AnalysisData {
-        print("📝 OCR extracted \(ocrText.count) characters")
-        print("🌐 Sending text to backend for classification and extraction...")
         let response = try await backendService.analyze(
             ocrText: ocrText,
             hint: hints?.suggestedType
         )
 
-        print("✅ Backend classified as: \(response.documentType) (confidence: \(String(format: "%.2f", response.confidence)))")
-        print("📊 Backend extracted \(response.fields.count) fields")
-
         return AnalysisData(
             ocrText: ocrText,
             fields: convertBackendFields(response.fields),
@@ -165,8 +190,6 @@ struct BackendDocumentAnalyzer: DocumentAnalyzer {
         }
 
         // Successfully parsed as array - expand into multiple fields
-        print("📋 Expanding array field '\(backendField.key)' with \(array.count) items")
-
         return array.enumerated().map { index, item in
             let itemValue = formattedArrayItem(item)
 
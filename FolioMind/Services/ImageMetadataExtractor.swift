@@ -62,6 +62,13 @@ struct ImageMetadataExtractor: ImageMetadataExtracting {
         return String(format: "%.4f, %.4f", normalizedLat, normalizedLon)
     }
 
+    private static let exifDateFormatter: DateFormatter = {
+        let formatter = DateFormatter()
+        formatter.dateFormat = "yyyy:MM:dd HH:mm:ss"
+        formatter.timeZone = TimeZone(secondsFromGMT: 0)
+        return formatter
+    }()
+
     private func parseCaptureDate(from exif: [CFString: Any]?) -> Date? {
         guard let exif else { return nil }
         let dateKeys: [CFString] = [
@@ -69,12 +76,8 @@ struct ImageMetadataExtractor: ImageMetadataExtracting {
             kCGImagePropertyExifDateTimeDigitized
         ]
 
-        let formatter = DateFormatter()
-        formatter.dateFormat = "yyyy:MM:dd HH:mm:ss"
-        formatter.timeZone = TimeZone(secondsFromGMT: 0)
-
         for key in dateKeys {
-            if let value = exif[key] as? String, let date = formatter.date(from: value) {
+            if let value = exif[key] as? String, let date = Self.exifDateFormatter.date(from: value) {
                 return date
             }
         }
@@ -99,6 +99,35 @@ enum ImagePreprocessor {
         }
     }
 
+    /// Write a downscaled JPEG copy of an image file for upload, or return nil if the image already fits
+    /// within `maxDimension`. Uses ImageIO thumbnailing, so the full-size image is never decoded.
+    static func downscaledCopyForUpload(of url: URL, maxDimension: CGFloat = 2048, quality: CGFloat = 0.85) -> URL? {
+        #if canImport(ImageIO)
+        guard
+            let source = CGImageSourceCreateWithURL(url as CFURL, nil),
+            let properties = CGImageSourceCopyPropertiesAtIndex(source, 0, nil) as? [CFString: Any]
+        else {
+            return nil
+        }
+
+        let width = properties[kCGImagePropertyPixelWidth] as? Int ?? 0
+        let height = properties[kCGImagePropertyPixelHeight] as? Int ?? 0
+        guard CGFloat(max(width, height)) > maxDimension else { return nil }
+
+        let options: [CFString: Any] = [
+            kCGImageSourceCreateThumbnailFromImageAlways: true,
+            kCGImageSourceCreateThumbnailWithTransform: true,
+            kCGImageSourceThumbnailMaxPixelSize: Int(maxDimension)
+        ]
+        guard let thumbnail = CGImageSourceCreateThumbnailAtIndex(source, 0, options as CFDictionary) else {
+            return nil
+        }
+        return try? saveTemporaryJPEG(UIImage(cgImage: thumbnail), quality: quality)
+        #else
+        return nil
+        #endif
+    }
+
     /// Normalize orientation to .up to ensure Vision and cropping work predictably.
     static func normalizeOrientation(_ image: UIImage) -> UIImage {
         guard image.imageOrientation != .up else { return image }
@@ -6,6 +6,7 @@
 //  Provides document-type-specific prompts and extraction logic.
 //
 
+import CryptoKit
 import Foundation
 import NaturalLanguage
 
@@ -15,15 +16,30 @@ import FoundationModels
 
 /// Protocol for LLM-based field extraction backends
 protocol LLMService {
+    /// Whether re-prompting can change the reply. Services that ignore the prompt return `false`,
+    /// so a malformed reply is not retried.
+    var followsPrompt: Bool { get }
+
     func extract(prompt: String, text: String) async throws -> String
     func cleanText(_ rawText: String) async throws -> String
 }
 
+extension LLMService {
+    var followsPrompt: Bool { true }
+}
+
 /// Intelligent field extractor that uses on-device AI and LLMs
 @MainActor
 final class IntelligentFieldExtractor {
     private let llmService: LLMService?
     private let useNaturalLanguage: Bool
+    /// Raw LLM responses keyed by a hash of service + prompt + document text, so re-extracting
+    /// identical OCR text (re-analysis, reclassification) doesn't call the model again.
+    private let responseCache: NSCache<NSString, NSString> = {
+        let cache = NSCache<NSString, NSString>()
+        cache.countLimit = 64
+        return cache
+    }()
 
     init(llmService: LLMService? = nil, useNaturalLanguage: Bool = true) {
         self.llmService = llmService
@@ -34,26 +50,28 @@ final class IntelligentFieldExtractor {
     func extractFields(from text: String, docType: DocumentType) async throws -> [Field] {
         var fields: [Field] = []
 
+        // Apply document-type-specific extraction
+        let documentSpecificFields = extractDocumentSpecificFields(from: text, docType: docType)
+
+        // Use LLM for structured extraction if available; start it before the NL pass so the
+        // network round trip overlaps it. Every type's schema has fields only the LLM produces, so
+        // pattern hits never make the call redundant.
+        let llmRequest = llmService.map { makeLLMRequest(from: text, docType: docType, service: $0) }
+        async let llmResponse = Self.fetchResponse(for: llmRequest, service: llmService)
+
         // Use Natural Language framework for entity recognition
         if useNaturalLanguage {
             fields.append(contentsOf: extractUsingNaturalLanguage(from: text))
         }
 
-        // Use LLM for structured extraction if available
-        if let llmService = llmService {
-            let llmFields = try await extractUsingLLM(
-                from: text,
-                docType: docType,
-                service: llmService
-            )
-            fields.append(contentsOf: llmFields)
+        if let llmService, let llmRequest, let response = try await llmResponse {
+            let json = try await structuredResponse(response, for: llmRequest, service: llmService)
+            fields.append(contentsOf: parseStructuredResponse(json, docType: docType))
         }
 
-        // Apply document-type-specific extraction
-        fields.append(contentsOf: extractDocumentSpecificFields(from: text, docType: docType))
+        fields.append(contentsOf: documentSpecificFields)
 
-        let merged = deduplicateAndMerge(fields, docType: docType)
-        return mapToSchema(merged, docType: docType)
+        return deduplicateAndMerge(fields, docType: docType)
     }
 
     // MARK: - Natural Language Framework Extraction
@@ -108,179 +126,266 @@ final class IntelligentFieldExtractor {
 
     // MARK: - LLM-Based Extraction
 
-    private func extractUsingLLM(
+    /// A prepared LLM call, with its reply if one is already cached.
+    private struct LLMRequest {
+        let prompt: String
+        /// The document text as sent to the model, after `truncatedForLLM`.
+        let text: String
+        let cacheKey: NSString
+        let cachedResponse: String?
+    }
+
+    /// How many times a reply that isn't a JSON object is sent back to the model with the parse error.
+    private static let maxJSONRetries = 1
+
+    /// Upper bound on document characters sent to the LLM (roughly 3k tokens).
+    private static let maxLLMTextLength = 12_000
+
+    /// Bounds prompt size for very long OCR text. Keeps the head, where headers, account and member
+    /// details sit, plus a shorter tail, where totals and amounts due usually are.
+    private static func truncatedForLLM(_ text: String) -> String {
+        guard text.count > maxLLMTextLength else { return text }
+        let tailLength = maxLLMTextLength / 3
+        return String(text.prefix(maxLLMTextLength - tailLength)) + "\n…\n" + String(text.suffix(tailLength))
+    }
+
+    private func makeLLMRequest(
         from text: String,
         docType: DocumentType,
         service: LLMService
-    ) async throws -> [Field] {
+    ) -> LLMRequest {
         // For generic documents, use comprehensive extraction prompt
         // For specific document types, use targeted prompts
-        let response: String
-        if docType == .generic {
-            response = try await extractWithComprehensivePrompt(from: text, service: service)
-        } else {
-            let prompt = buildPrompt(for: docType)
-            response = try await service.extract(prompt: prompt, text: text)
+        let prompt = docType == .generic ? Self.comprehensivePrompt : buildPrompt(for: docType)
+        let llmText = Self.truncatedForLLM(text)
+        let cacheKey = Self.cacheKey(service: service, prompt: prompt, text: llmText)
+        let cached = responseCache.object(forKey: cacheKey) as String?
+        return LLMRequest(prompt: prompt, text: llmText, cacheKey: cacheKey, cachedResponse: cached)
+    }
+
+    /// Nonisolated so that, started with `async let`, the round trip runs off the main actor while the
+    /// caller does its on-device extraction; it is still cancelled along with the caller.
+    private nonisolated static func fetchResponse(for request: LLMRequest?, service: LLMService?) async throws -> String? {
+        guard let request, let service else { return nil }
+        if let cached = request.cachedResponse {
+            return cached
         }
-        return parseStructuredResponse(response, docType: docType)
+        return try await service.extract(prompt: request.prompt, text: request.text)
     }
-    
-    /// Extracts fields using a comprehensive prompt suitable for any document type
-    private func extractWithComprehensivePrompt(
-        from text: String,
+
+    /// Decodes the JSON object in an LLM reply. A malformed reply is retried once, immediately, with
+    /// the parse error appended to the prompt; only replies that decode are cached.
+    private func structuredResponse(
+        _ initialResponse: String,
+        for request: LLMRequest,
         service: LLMService
-    ) async throws -> String {
-        let prompt = """
-        You are an information extraction engine for arbitrary real-world documents
-        (e.g. insurance cards, billing statements, property tax notices, utility bills,
-        receipts, bank statements, government letters, etc.).
-
-        TASK
-        - Read the document text.
-        - Infer what type of document it is.
-        - Normalize the content.
-        - Extract as many relevant fields as you can.
-        - Return a single JSON object that follows the schema below.
-
-        OUTPUT RULES
-        - Output **only** a JSON object, no extra text or explanations.
-        - Use double quotes for all keys and string values.
-        - Omit any field you cannot confidently determine.
-        - Do NOT invent values or guess IDs, dates, or amounts.
-        - Use English for all field values, even if the source text is in another language.
-
-        DOCUMENT TYPE
-        - Infer a high-level type:
-          - "credit_card", "debit_card", "insurance_card",
-            "billing_statement", "bank_statement", "receipt",
-            "utility_bill", "property_tax", "tax_document",
-            "government_notice", "id_document", "other"
-        - Put this in "document_type".
-        - Optionally add a short free-text "document_subtype" if helpful.
-
-        NORMALIZATION RULES
-        - Card numbers:
-          - Return **only the last 4 digits** in "card_number".
-          - Mask the rest with "X" if needed, e.g. "XXXX-XXXX-XXXX-1234".
-        - Dates:
-          - Prefer ISO format: "YYYY-MM-DD" if full date is known.
-          - If only month/year is known, use "YYYY-MM".
-          - If only year is known, use "YYYY".
-        - Money amounts:
-          - Return as strings with two decimal places, e.g. "123.45".
-          - Include currency symbol if present in the original text (e.g. "$123.45").
-        - Phone numbers:
-          - Normalize to a standard readable format when possible,
-            e.g. "(800) 123-4567" or "+1-800-123-4567".
-        - Addresses:
-          - Keep as a single line or a small set of lines, but remove obvious line breaks
-            that split a street address awkwardly.
-
-        POSSIBLE FIELDS (use only what applies)
-
-        Meta & general
-        - "document_type": one of the values listed above
-        - "document_subtype": "short free-text subtype (optional)"
-        - "title": "document title or subject"
-        - "primary_date": "main date for this document (normalized)"
-        - "all_dates": ["other dates mentioned, normalized if possible"]
-        - "names": ["any person names mentioned"]
-        - "organizations": ["any organization, company, or government names"]
-        - "reference_numbers": ["any IDs or reference numbers"]
-        - "key_information": "short summary of the most important details"
-
-        Parties & contact
-        - "account_holder_name": "primary person/entity responsible for the account"
-        - "recipient_name": "to whom this document is addressed"
-        - "sender_name": "who issued this document"
-        - "billing_address": "billing address if present"
-        - "service_address": "service location if present"
-        - "mailing_address": "mailing address if different"
-        - "phone_number": "main customer service or contact phone"
-        - "email": "contact email if present"
-
-        Financial summary (generic)
-        - "account_number": "account or loan number"
-        - "statement_date": "statement or notice date"
-        - "billing_period": "billing period date range"
-        - "due_date": "payment due date"
-        - "amount_due": "total amount due"
-        - "minimum_payment": "minimum payment amount"
-        - "previous_balance": "previous balance"
-        - "new_charges": "new charges"
-        - "payments_received": "payments applied"
-        - "fees": "any fees if explicitly listed"
-        - "taxes": "any taxes if explicitly listed"
-        - "currency": "currency code or symbol if clearly indicated"
-        - "line_items": [
-            {
-              "description": "item/charge description",
-              "date": "item date if available",
-              "amount": "item amount"
-            }
-          ]
-
-        Card-specific (credit/debit)
-        - "cardholder": "name on card"
-        - "card_number": "card number (last 4 digits only)"
-        - "expiry_date": "expiration date (normalized)"
-        - "issuer": "card issuer / bank name"
-        - "card_type": "visa | mastercard | amex | discover | other"
-
-        Insurance-specific
-        - "member_name": "insured member name(s) - if multiple family members are listed,
-          provide comma-separated names (e.g. 'JOHN DOE, JANE DOE, JIMMY DOE')"
-        - "member_id": "member / subscriber ID"
-        - "group_number": "group number"
-        - "payer_number": "payer number / payer ID (common on dental cards)"
-        - "policy_number": "policy number"
-        - "plan_name": "insurance plan name"
-        - "insurance_company": "insurance provider / company name"
-        - "effective_date": "coverage effective date"
-        - "copay": "copay amounts if shown"
-        - "rx_bin": "prescription BIN"
-        - "rx_pcn": "prescription PCN"
-
-        Property / tax-specific
-        - "property_address": "property location"
-        - "parcel_number": "parcel / lot / tax ID"
-        - "property_id": "other property identifier"
-        - "tax_year": "tax year"
-        - "assessed_value": "assessed property value"
-        - "taxable_value": "taxable value"
-        - "tax_amount": "total tax amount"
-        - "installments": [
-            {
-              "due_date": "installment due date",
-              "amount": "installment amount"
+    ) async throws -> [String: Any] {
+        var response = Self.strippingCodeFence(initialResponse)
+        var retriesLeft = service.followsPrompt ? Self.maxJSONRetries : 0
+        while true {
+            let parseError: String
+            do {
+                if let json = try JSONSerialization.jsonObject(with: Data(response.utf8)) as? [String: Any] {
+                    responseCache.setObject(response as NSString, forKey: request.cacheKey)
+                    return json
+                }
+                parseError = "the top-level value is not an object"
+            } catch {
+                parseError = error.localizedDescription
             }
-          ]
-
-        Utilities / services (electricity, water, gas, internet, etc.)
-        - "service_type": "electricity | water | gas | internet | phone | other"
-        - "meter_number": "meter or service ID"
-        - "usage_period": "usage period date range"
-        - "usage_amount": "usage quantity (e.g. kWh, gallons, GB) if given"
-
-        Free-form fallback
-        - "amounts": ["any monetary amounts mentioned"]
-        - "other_fields": {
-            "key": "value",
-            "key2": "value2"
-          }
-
-        RULES FOR FIELD SELECTION
-        - Only include fields that clearly apply to this document.
-        - If there are multiple plausible values for one field, choose the one that best matches
-          how real documents are usually structured (e.g. the main amount due, the primary date).
-        - If you are unsure, omit the field instead of guessing.
-
-        Now extract and return a single JSON object for this document.
-        """
-        let response = try await service.extract(prompt: prompt, text: text)
-        return response
+
+            guard retriesLeft > 0 else { return [:] }
+            retriesLeft -= 1
+            let retryPrompt = """
+            \(request.prompt)
+
+            Your previous reply could not be parsed as JSON: \(parseError)
+            Previous reply:
+            \(response)
+
+            Return only a single valid JSON object.
+            """
+            response = Self.strippingCodeFence(try await service.extract(prompt: retryPrompt, text: request.text))
+        }
+    }
+
+    /// Removes a Markdown code fence (```json ... ```) around a reply; models without a JSON mode often add one.
+    private static func strippingCodeFence(_ reply: String) -> String {
+        let trimmed = reply.trimmingCharacters(in: .whitespacesAndNewlines)
+        guard trimmed.hasPrefix("```") else { return trimmed }
+
+        var body = trimmed.dropFirst(3)
+        if let newline = body.firstIndex(of: "\n") {
+            // Drop the language tag line
+            body = body[body.index(after: newline)...]
+        } else if body.hasPrefix("json") {
+            body = body.dropFirst(4)
+        }
+        if body.hasSuffix("```") {
+            body = body.dropLast(3)
+        }
+        return body.trimmingCharacters(in: .whitespacesAndNewlines)
     }
 
+    private static func cacheKey(service: LLMService, prompt: String, text: String) -> NSString {
+        var hasher = SHA256()
+        for part in [String(describing: type(of: service)), prompt, text] {
+            hasher.update(data: Data(part.utf8))
+            hasher.update(data: Data([0]))
+        }
+        let hex = hasher.finalize().map { String(format: "%02x", $0) }.joined()
+        return hex as NSString
+    }
+    
+    /// Comprehensive prompt suitable for any document type
+    private static let comprehensivePrompt = """
+    You are an information extraction engine for arbitrary real-world documents
+    (e.g. insurance cards, billing statements, property tax notices, utility bills,
+    receipts, bank statements, government letters, etc.).
+
+    TASK
+    - Read the document text.
+    - Infer what type of document it is.
+    - Normalize the content.
+    - Extract as many relevant fields as you can.
+    - Return a single JSON object that follows the schema below.
+
+    OUTPUT RULES
+    - Output **only** a JSON object, no extra text or explanations.
+    - Use double quotes for all keys and string values.
+    - Omit any field you cannot confidently determine.
+    - Do NOT invent values or guess IDs, dates, or amounts.
+    - Use English for all field values, even if the source text is in another language.
+
+    DOCUMENT TYPE
+    - Infer a high-level type:
+      - "credit_card", "debit_card", "insurance_card",
+        "billing_statement", "bank_statement", "receipt",
+        "utility_bill", "property_tax", "tax_document",
+        "government_notice", "id_document", "other"
+    - Put this in "document_type".
+    - Optionally add a short free-text "document_subtype" if helpful.
+
+    NORMALIZATION RULES
+    - Card numbers:
+      - Return **only the last 4 digits** in "card_number".
+      - Mask the rest with "X" if needed, e.g. "XXXX-XXXX-XXXX-1234".
+    - Dates:
+      - Prefer ISO format: "YYYY-MM-DD" if full date is known.
+      - If only month/year is known, use "YYYY-MM".
+      - If only year is known, use "YYYY".
+    - Money amounts:
+      - Return as strings with two decimal places, e.g. "123.45".
+      - Include currency symbol if present in the original text (e.g. "$123.45").
+    - Phone numbers:
+      - Normalize to a standard readable format when possible,
+        e.g. "(800) 123-4567" or "+1-800-123-4567".
+    - Addresses:
+      - Keep as a single line or a small set of lines, but remove obvious line breaks
+        that split a street address awkwardly.
+
+    POSSIBLE FIELDS (use only what applies)
+
+    Meta & general
+    - "document_type": one of the values listed above
+    - "document_subtype": "short free-text subtype (optional)"
+    - "title": "document title or subject"
+    - "primary_date": "main date for this document (normalized)"
+    - "all_dates": ["other dates mentioned, normalized if possible"]
+    - "names": ["any person names mentioned"]
+    - "organizations": ["any organization, company, or government names"]
+    - "reference_numbers": ["any IDs or reference numbers"]
+    - "key_information": "short summary of the most important details"
+
+    Parties & contact
+    - "account_holder_name": "primary person/entity responsible for the account"
+    - "recipient_name": "to whom this document is addressed"
+    - "sender_name": "who issued this document"
+    - "billing_address": "billing address if present"
+    - "service_address": "service location if present"
+    - "mailing_address": "mailing address if different"
+    - "phone_number": "main customer service or contact phone"
+    - "email": "contact email if present"
+
+    Financial summary (generic)
+    - "account_number": "account or loan number"
+    - "statement_date": "statement or notice date"
+    - "billing_period": "billing period date range"
+    - "due_date": "payment due date"
+    - "amount_due": "total amount due"
+    - "minimum_payment": "minimum payment amount"
+    - "previous_balance": "previous balance"
+    - "new_charges": "new charges"
+    - "payments_received": "payments applied"
+    - "fees": "any fees if explicitly listed"
+    - "taxes": "any taxes if explicitly listed"
+    - "currency": "currency code or symbol if clearly indicated"
+    - "line_items": [
+        {
+          "description": "item/charge description",
+          "date": "item date if available",
+          "amount": "item amount"
+        }
+      ]
+
+    Card-specific (credit/debit)
+    - "cardholder": "name on card"
+    - "card_number": "card number (last 4 digits only)"
+    - "expiry_date": "expiration date (normalized)"
+    - "issuer": "card issuer / bank name"
+    - "card_type": "visa | mastercard | amex | discover | other"
+
+    Insurance-specific
+    - "member_name": "insured member name(s) - if multiple family members are listed,
+      provide comma-separated names (e.g. 'JOHN DOE, JANE DOE, JIMMY DOE')"
+    - "member_id": "member / subscriber ID"
+    - "group_number": "group number"
+    - "payer_number": "payer number / payer ID (common on dental cards)"
+    - "policy_number": "policy number"
+    - "plan_name": "insurance plan name"
+    - "insurance_company": "insurance provider / company name"
+    - "effective_date": "coverage effective date"
+    - "copay": "copay amounts if shown"
+    - "rx_bin": "prescription BIN"
+    - "rx_pcn": "prescription PCN"
+
+    Property / tax-specific
+    - "property_address": "property location"
+    - "parcel_number": "parcel / lot / tax ID"
+    - "property_id": "other property identifier"
+    - "tax_year": "tax year"
+    - "assessed_value": "assessed property value"
+    - "taxable_value": "taxable value"
+    - "tax_amount": "total tax amount"
+    - "installments": [
+        {
+          "due_date": "installment due date",
+          "amount": "installment amount"
+        }
+      ]
+
+    Utilities / services (electricity, water, gas, internet, etc.)
+    - "service_type": "electricity | water | gas | internet | phone | other"
+    - "meter_number": "meter or service ID"
+    - "usage_period": "usage period date range"
+    - "usage_amount": "usage quantity (e.g. kWh, gallons, GB) if given"
+
+    Free-form fallback
+    - "amounts": ["any monetary amounts mentioned"]
+    - "other_fields": {
+        "key": "value",
+        "key2": "value2"
+      }
+
+    RULES FOR FIELD SELECTION
+    - Only include fields that clearly apply to this document.
+    - If there are multiple plausible values for one field, choose the one that best matches
+      how real documents are usually structured (e.g. the main amount due, the primary date).
+    - If you are unsure, omit the field instead of guessing.
+
+    Now extract and return a single JSON object for this document.
+    """
+
     private func buildPrompt(for docType: DocumentType) -> String {
         switch docType {
         case .creditCard:
@@ -426,15 +531,9 @@ final class IntelligentFieldExtractor {
         }
     }
 
-    private func parseStructuredResponse(_ response: String, docType: DocumentType) -> [Field] {
+    private func parseStructuredResponse(_ json: [String: Any], docType: DocumentType) -> [Field] {
         var fields: [Field] = []
 
-        // Try to parse JSON response
-        let data = Data(response.utf8)
-        guard let json = try? JSONSerialization.jsonObject(with: data) as? [String: Any] else {
-            return fields
-        }
-
         for (key, value) in json {
             // Handle different value types
             let stringValue: String
@@ -507,6 +606,19 @@ final class IntelligentFieldExtractor {
         }
     }
 
+    /// Literals that every pattern in a group needs; when none occur, the group's regexes are skipped.
+    private enum PatternAnchor {
+        case accountNumber, transactionID, promoCode, offerExpiry, offerAmount
+    }
+
+    private static let patternAnchorMatcher = KeywordMatcher<PatternAnchor>([
+        .accountNumber: ["account", "acct"],
+        .transactionID: ["trans", "receipt", "#"],
+        .promoCode: ["code"],
+        .offerExpiry: ["expire", "end", "through", "until", "by"],
+        .offerAmount: ["get", "earn", "receive", "save", "bonus", "reward", "off", "credit"]
+    ], caseInsensitive: true)
+
     private func extractCreditCardFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
@@ -547,18 +659,29 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let memberIDRegexes: [NSRegularExpression] = [
+        "\\bID[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,20}?)(?=\\s*\\n|\\s{2,}|$)",
+        "(?:member|subscriber)\\s*(?:id|#)?[:\\s#]*([A-Z0-9][A-Z0-9\\s-]{3,20}?)(?=\\s*\\n|\\s{2,}|$)"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+    private static let groupRegexes: [NSRegularExpression] = [
+        "(?:den(?:tal)?\\s+)?(?:group|grp)[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)",
+        "\\bgrp#?[:\\s#]*([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+    private static let payerRegex = try? NSRegularExpression(
+        pattern: "payer[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)",
+        options: .caseInsensitive
+    )
+    private static let memberNameRegex = try? NSRegularExpression(
+        pattern: #"^\s*\d{1,2}\.?\s+([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)+|[A-Z]{2,}(?:\s+[A-Z]{2,})+)"#,
+        options: [.anchorsMatchLines]
+    )
+
     private func extractInsuranceFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
         // Extract member ID (handles formats like "ID W2966", "Member ID 1234", "Subscriber# ABC123456", etc.)
-        let memberIDPatterns = [
-            "\\bID[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,20}?)(?=\\s*\\n|\\s{2,}|$)",
-            "(?:member|subscriber)\\s*(?:id|#)?[:\\s#]*([A-Z0-9][A-Z0-9\\s-]{3,20}?)(?=\\s*\\n|\\s{2,}|$)"
-        ]
-
-        for pattern in memberIDPatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        for regex in Self.memberIDRegexes {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 let memberId = String(text[range]).trimmingCharacters(in: .whitespacesAndNewlines)
                 fields.append(Field(
@@ -572,14 +695,8 @@ final class IntelligentFieldExtractor {
         }
 
         // Extract group number (handles "Den Grp #:", "Group:", etc.)
-        let groupPatterns = [
-            "(?:den(?:tal)?\\s+)?(?:group|grp)[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)",
-            "\\bgrp#?[:\\s#]*([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)"
-        ]
-
-        for pattern in groupPatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        for regex in Self.groupRegexes {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 let groupNum = String(text[range]).trimmingCharacters(in: .whitespacesAndNewlines)
                 fields.append(Field(
@@ -593,8 +710,7 @@ final class IntelligentFieldExtractor {
         }
 
         // Extract payer number (new field for dental/medical cards)
-        let payerPattern = "payer[:\\s#]+([A-Z0-9][A-Z0-9\\s-]{3,25}?)(?=\\s*\\n|\\s{2,}|$)"
-        if let regex = try? NSRegularExpression(pattern: payerPattern, options: .caseInsensitive),
+        if let regex = Self.payerRegex,
            let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
            let range = Range(match.range(at: 1), in: text) {
             let payerNum = String(text[range]).trimmingCharacters(in: .whitespacesAndNewlines)
@@ -639,9 +755,12 @@ final class IntelligentFieldExtractor {
             }
             .filter { !$0.isEmpty }
 
+        // Lowercase each line once; the plan heuristics below test several keywords per line
+        let lowercasedLines = lines.map { $0.lowercased() }
+
         // Look for lines with specific plan keywords, prioritizing actual plan types
-        let planCandidates = lines.filter { line in
-            let lower = line.lowercased()
+        let planCandidates = lines.indices.filter { index in
+            let lower = lowercasedLines[index]
             // Match actual plan types (PPO, HMO, EPO, etc.) but exclude generic service names
             return (lower.contains("ppo") || lower.contains("hmo") || lower.contains("epo") ||
                     lower.contains("pos") || lower.contains("dental") || lower.contains("vision") ||
@@ -649,8 +768,8 @@ final class IntelligentFieldExtractor {
                 && !lower.contains("advocate") // Exclude service names
                 && !lower.contains("see your plan") // Exclude instructions
                 && !lower.contains("www.") // Exclude URLs
-                && line.count < 60 // Reasonable plan name length
-        }
+                && lines[index].count < 60 // Reasonable plan name length
+        }.map { lines[$0] }
 
         // Prefer shortest relevant plan, fall back to the line following insurer if present
         if let plan = planCandidates.min(by: { $0.count < $1.count }) {
@@ -661,13 +780,13 @@ final class IntelligentFieldExtractor {
                 source: .vision
             ))
         } else {
-            if let insurerLineIndex = lines.firstIndex(where: { line in
-                let lowerLine = line.lowercased()
-                return lowerLine.contains("aetna") || lowerLine.contains("cvs health")
+            if let insurerLineIndex = lowercasedLines.firstIndex(where: { lowerLine in
+                lowerLine.contains("aetna") || lowerLine.contains("cvs health")
             }),
                lines.indices.contains(insurerLineIndex + 1) {
                 let candidate = lines[insurerLineIndex + 1]
-                if candidate.lowercased().contains("ppo") || candidate.lowercased().contains("dental") {
+                let lowerCandidate = lowercasedLines[insurerLineIndex + 1]
+                if lowerCandidate.contains("ppo") || lowerCandidate.contains("dental") {
                     fields.append(Field(
                         key: "plan_name",
                         value: candidate,
@@ -680,10 +799,8 @@ final class IntelligentFieldExtractor {
 
         // Extract member names listed with numeric prefixes
         // Handles "01 JAY ZENG" (all caps) or "01. Jay Zeng" (title case)
-        let namePattern = #"^\s*\d{1,2}\.?\s+([A-Z][A-Za-z]+(?:\s+[A-Z][A-Za-z]+)+|[A-Z]{2,}(?:\s+[A-Z]{2,})+)"#
-        let nameRegex = try? NSRegularExpression(pattern: namePattern, options: [.anchorsMatchLines])
         var enumeratedNames: [String] = []
-        if let nameRegex {
+        if let nameRegex = Self.memberNameRegex {
             let matches = nameRegex.matches(in: text, range: NSRange(text.startIndex..., in: text))
             for match in matches {
                 if let range = Range(match.range(at: 1), in: text) {
@@ -721,12 +838,19 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let accountRegex = try? NSRegularExpression(
+        pattern: "(?:account|acct)[:\\\\s#]+([0-9-]+)",
+        options: .caseInsensitive
+    )
+
     private func extractBillFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
+        let anchors = Self.patternAnchorMatcher.matches(in: text)
+
         // Extract account number
-        let accountPattern = "(?:account|acct)[:\\\\s#]+([0-9-]+)"
-        if let regex = try? NSRegularExpression(pattern: accountPattern, options: .caseInsensitive),
+        if anchors.contains(.accountNumber),
+           let regex = Self.accountRegex,
            let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
            let range = Range(match.range(at: 1), in: text) {
             fields.append(Field(
@@ -740,12 +864,16 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let heightRegex = try? NSRegularExpression(
+        pattern: "(?:ht|height)[:\\\\s]+([45]'[\\\\s]?\\\\d{1,2}\"?|[45]-\\\\d{1,2})",
+        options: .caseInsensitive
+    )
+
     private func extractIDFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
         // Extract height
-        let heightPattern = "(?:ht|height)[:\\\\s]+([45]'[\\\\s]?\\\\d{1,2}\"?|[45]-\\\\d{1,2})"
-        if let regex = try? NSRegularExpression(pattern: heightPattern, options: .caseInsensitive),
+        if let regex = Self.heightRegex,
            let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
            let range = Range(match.range(at: 1), in: text) {
             fields.append(Field(
@@ -759,12 +887,16 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let subjectRegex = try? NSRegularExpression(
+        pattern: "(?:re|subject|regarding)[:\\\\s]+([^\\\\n]{10,100})",
+        options: .caseInsensitive
+    )
+
     private func extractLetterFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
         // Extract RE: or Subject line
-        let subjectPattern = "(?:re|subject|regarding)[:\\\\s]+([^\\\\n]{10,100})"
-        if let regex = try? NSRegularExpression(pattern: subjectPattern, options: .caseInsensitive),
+        if let regex = Self.subjectRegex,
            let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
            let range = Range(match.range(at: 1), in: text) {
             fields.append(Field(
@@ -778,18 +910,19 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let transactionRegexes: [NSRegularExpression] = [
+        "(?:transaction|trans|receipt)[:\\\\s#]+([A-Z0-9-]{6,20})",
+        "#([A-Z0-9-]{6,20})"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+
     private func extractReceiptFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
-        // Extract transaction ID
-        let transactionPatterns = [
-            "(?:transaction|trans|receipt)[:\\\\s#]+([A-Z0-9-]{6,20})",
-            "#([A-Z0-9-]{6,20})"
-        ]
+        let anchors = Self.patternAnchorMatcher.matches(in: text)
 
-        for pattern in transactionPatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        // Extract transaction ID
+        for regex in Self.transactionRegexes where anchors.contains(.transactionID) {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 fields.append(Field(
                     key: "transaction_id",
@@ -804,18 +937,29 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let promoCodeRegexes: [NSRegularExpression] = [
+        "(?:promo(?:tional)?\\s+code|offer\\s+code|use\\s+code)[:\\s]+([A-Z0-9]+)",
+        "code[:\\s]+([A-Z0-9]{4,20})"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+    private static let offerExpiryRegexes: [NSRegularExpression] = [
+        "(?:offer\\s+)?expires?[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
+        "(?:offer\\s+)?ends?[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
+        "(?:valid\\s+)?(?:through|until|by)[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
+        "(?:promotion\\s+)?ends?[:\\s]+(\\d{1,2}/\\d{1,2}/\\d{2,4})"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+    private static let offerAmountRegexes: [NSRegularExpression] = [
+        "(?:get|earn|receive|save)\\s+\\$?(\\d{1,4}(?:,\\d{3})*)",
+        "\\$?(\\d{1,4}(?:,\\d{3})*)\\s+(?:bonus|reward|off|credit)"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+
     private func extractPromotionalFields(from text: String) -> [Field] {
         var fields: [Field] = []
 
-        // Extract promo code
-        let promoCodePatterns = [
-            "(?:promo(?:tional)?\\s+code|offer\\s+code|use\\s+code)[:\\s]+([A-Z0-9]+)",
-            "code[:\\s]+([A-Z0-9]{4,20})"
-        ]
+        let anchors = Self.patternAnchorMatcher.matches(in: text)
 
-        for pattern in promoCodePatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        // Extract promo code
+        for regex in Self.promoCodeRegexes where anchors.contains(.promoCode) {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 fields.append(Field(
                     key: "promo_code",
@@ -828,16 +972,8 @@ final class IntelligentFieldExtractor {
         }
 
         // Extract offer expiration
-        let expirationPatterns = [
-            "(?:offer\\s+)?expires?[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
-            "(?:offer\\s+)?ends?[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
-            "(?:valid\\s+)?(?:through|until|by)[:\\s]+([A-Za-z]+\\s+\\d{1,2},?\\s+\\d{4})",
-            "(?:promotion\\s+)?ends?[:\\s]+(\\d{1,2}/\\d{1,2}/\\d{2,4})"
-        ]
-
-        for pattern in expirationPatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        for regex in Self.offerExpiryRegexes where anchors.contains(.offerExpiry) {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 fields.append(Field(
                     key: "offer_expiry",
@@ -850,14 +986,8 @@ final class IntelligentFieldExtractor {
         }
 
         // Extract offer amount
-        let offerAmountPatterns = [
-            "(?:get|earn|receive|save)\\s+\\$?(\\d{1,4}(?:,\\d{3})*)",
-            "\\$?(\\d{1,4}(?:,\\d{3})*)\\s+(?:bonus|reward|off|credit)"
-        ]
-
-        for pattern in offerAmountPatterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        for regex in Self.offerAmountRegexes where anchors.contains(.offerAmount) {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 fields.append(Field(
                     key: "offer_amount",
@@ -872,16 +1002,19 @@ final class IntelligentFieldExtractor {
         return fields
     }
 
+    private static let cardExpiryRegexes: [NSRegularExpression] = [
+        "(?:exp(?:iry)?|valid thru|good thru|expires)[:\\\\s]*([0-9]{1,2}[/-][0-9]{2,4})",
+        "([0-9]{2}[/-][0-9]{2})\\\\s*(?:exp|expiry|expires)"
+    ].compactMap { try? NSRegularExpression(pattern: $0, options: .caseInsensitive) }
+
     private func extractExpiryDate(from text: String) -> Field? {
-        // Look for expiry with context
-        let patterns = [
-            "(?:exp(?:iry)?|valid thru|good thru|expires)[:\\\\s]*([0-9]{1,2}[/-][0-9]{2,4})",
-            "([0-9]{2}[/-][0-9]{2})\\\\s*(?:exp|expiry|expires)"
-        ]
+        // Every pattern needs "exp" or "thru"; skip both scans when neither is present
+        guard text.range(of: "exp", options: .caseInsensitive) != nil
+                || text.range(of: "thru", options: .caseInsensitive) != nil else { return nil }
 
-        for pattern in patterns {
-            if let regex = try? NSRegularExpression(pattern: pattern, options: .caseInsensitive),
-               let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
+        // Look for expiry with context
+        for regex in Self.cardExpiryRegexes {
+            if let match = regex.firstMatch(in: text, range: NSRange(text.startIndex..., in: text)),
                let range = Range(match.range(at: 1), in: text) {
                 return Field(
                     key: "expiry_date",
@@ -897,66 +1030,83 @@ final class IntelligentFieldExtractor {
 
     // MARK: - Deduplication and Merging
 
+    /// Canonicalizes keys, drops keys outside the document's schema and keeps the best field per key.
+    /// Winners are chosen on plain key/value strings; only the surviving models are written back,
+    /// since every property set on a `Field` goes through SwiftData change tracking.
     private func deduplicateAndMerge(_ fields: [Field], docType: DocumentType) -> [Field] {
-        var merged: [String: Field] = [:]
+        let allowed = Self.schemaKeys[docType] ?? []
+        let aliases = Self.keyAliases[docType] ?? [:]
+        var merged: [String: (field: Field, value: String)] = [:]
 
         for field in fields {
-            let canonical = canonicalize(field, for: docType)
-            let key = canonical.key.lowercased()
+            let key = canonicalKey(for: field.key, aliases: aliases)
+            guard allowed.isEmpty || allowed.contains(key) else { continue }
+            let value = normalizeValue(field.value, for: key)
 
             if let existing = merged[key] {
                 // Keep the field with higher confidence
-                if canonical.confidence > existing.confidence {
-                    merged[key] = canonical
-                } else if canonical.confidence == existing.confidence && canonical.value.count > existing.value.count {
+                if field.confidence > existing.field.confidence {
+                    merged[key] = (field, value)
+                } else if field.confidence == existing.field.confidence && value.count > existing.value.count {
                     // If same confidence, prefer longer/more complete value
-                    merged[key] = canonical
+                    merged[key] = (field, value)
                 }
             } else {
-                merged[key] = canonical
+                merged[key] = (field, value)
             }
         }
 
-        return Array(merged.values)
+        return merged.map { key, winner in
+            canonicalize(winner.field, key: key, value: winner.value)
+        }
     }
 
-    private func canonicalize(_ field: Field, for docType: DocumentType) -> Field {
-        let canonicalKey = canonicalKey(for: field.key, docType: docType)
-        let normalizedValue = normalizeValue(field.value, for: canonicalKey)
-
-        field.key = canonicalKey
-        field.value = normalizedValue
+    private func canonicalize(_ field: Field, key: String, value: String) -> Field {
+        if field.key != key {
+            field.key = key
+        }
+        if field.value != value {
+            field.value = value
+        }
         if field.originalValue.isEmpty {
-            field.originalValue = normalizedValue
+            field.originalValue = value
         }
 
         return field
     }
 
-    private func canonicalKey(for rawKey: String, docType: DocumentType) -> String {
+    /// Raw key -> canonical key, resolved per document type up front so merging is one lookup per field.
+    private static let keyAliases: [DocumentType: [String: String]] = {
+        var shared: [String: String] = [:]
+        for alias in ["exp", "exp_date", "expiry", "expiry_date", "expiration", "expiration_date", "valid_thru", "valid_through"] {
+            shared[alias] = "expiry_date"
+        }
+        for alias in ["issuer", "bank", "bank_name"] {
+            shared[alias] = "issuer"
+        }
+
+        var creditCard = shared
+        for alias in ["card_number", "cardnumber", "card_no", "card_num", "pan"] {
+            creditCard[alias] = "card_number"
+        }
+        for alias in ["cardholder", "card_holder", "name"] {
+            creditCard[alias] = "cardholder"
+        }
+        for alias in ["card_type", "network"] {
+            creditCard[alias] = "card_type"
+        }
+
+        var aliases = Dictionary(uniqueKeysWithValues: DocumentType.allCases.map { ($0, shared) })
+        aliases[.creditCard] = creditCard
+        return aliases
+    }()
+
+    private func canonicalKey(for rawKey: String, aliases: [String: String]) -> String {
         let trimmed = rawKey.trimmingCharacters(in: .whitespacesAndNewlines)
         let normalized = trimmed
             .lowercased()
             .replacingOccurrences(of: " ", with: "_")
-
-        switch normalized {
-        case "exp", "exp_date", "expiry", "expiry_date", "expiration", "expiration_date", "valid_thru", "valid_through":
-            return "expiry_date"
-        case "card_number", "cardnumber", "card_no", "card_num", "pan":
-            return docType == .creditCard ? "card_number" : normalized
-        case "cardholder", "card_holder":
-            return docType == .creditCard ? "cardholder" : normalized
-        case "name":
-            if docType == .creditCard { return "cardholder" }
-            if docType == .idCard { return "name" }
-            return normalized
-        case "issuer", "bank", "bank_name":
-            return "issuer"
-        case "card_type", "network":
-            return docType == .creditCard ? "card_type" : normalized
-        default:
-            return normalized
-        }
+        return aliases[normalized] ?? normalized
     }
 
     private func normalizeValue(_ value: String, for key: String) -> String {
@@ -976,97 +1126,90 @@ final class IntelligentFieldExtractor {
         }
     }
 
-    private func mapToSchema(_ fields: [Field], docType: DocumentType) -> [Field] {
-        let allowed = allowedKeys(for: docType)
-        guard !allowed.isEmpty else { return fields }
-
-        return fields.compactMap { field in
-            let key = field.key.lowercased()
-            guard allowed.contains(key) else { return nil }
-            return field
-        }
-    }
-
-    private func allowedKeys(for docType: DocumentType) -> Set<String> {
-        switch docType {
-        case .creditCard:
-            return ["cardholder", "card_number", "expiry_date", "issuer", "card_type"]
-        case .insuranceCard:
-            return [
-                "member_name",
-                "member_id",
-                "group_number",
-                "payer_number",
-                "policy_number",
-                "plan_name",
-                "insurance_company",
-                "effective_date",
-                "copay",
-                "phone_number",
-                "rx_bin",
-                "rx_pcn"
-            ]
-        case .billStatement:
-            return [
-                "account_number",
-                "statement_date",
-                "due_date",
-                "amount_due",
-                "minimum_payment",
-                "previous_balance",
-                "new_charges",
-                "merchant",
-                "billing_period"
-            ]
-        case .idCard:
-            return [
-                "name",
-                "id_number",
-                "date_of_birth",
-                "issue_date",
-                "expiry_date",
-                "address",
-                "issuing_authority",
-                "class",
-                "height",
-                "sex"
-            ]
-        case .letter:
-            return [
-                "sender",
-                "sender_address",
-                "recipient",
-                "recipient_address",
-                "date",
-                "subject",
-                "reference_number",
-                "key_dates",
-                "action_required"
-            ]
-        case .receipt:
-            return ["merchant", "date", "time", "total", "subtotal", "tax", "payment_method", "last_four", "transaction_id", "items"]
-        case .promotional:
-            return [
-                "offer_description",
-                "promo_code",
-                "offer_amount",
-                "requirements",
-                "expiration_date",
-                "company",
-                "phone_number",
-                "website",
-                "terms"
-            ]
-        case .generic:
-            return []
-        }
-    }
+    /// Keys kept for each document type; types without an entry keep every key.
+    private static let schemaKeys: [DocumentType: Set<String>] = [
+        .creditCard: ["cardholder", "card_number", "expiry_date", "issuer", "card_type"],
+        .insuranceCard: [
+            "member_name",
+            "member_id",
+            "group_number",
+            "payer_number",
+            "policy_number",
+            "plan_name",
+            "insurance_company",
+            "effective_date",
+            "copay",
+            "phone_number",
+            "rx_bin",
+            "rx_pcn"
+        ],
+        .billStatement: [
+            "account_number",
+            "statement_date",
+            "due_date",
+            "amount_due",
+            "minimum_payment",
+            "previous_balance",
+            "new_charges",
+            "merchant",
+            "billing_period"
+        ],
+        .idCard: [
+            "name",
+            "id_number",
+            "date_of_birth",
+            "issue_date",
+            "expiry_date",
+            "address",
+            "issuing_authority",
+            "class",
+            "height",
+            "sex"
+        ],
+        .letter: [
+            "sender",
+            "sender_address",
+            "recipient",
+            "recipient_address",
+            "date",
+            "subject",
+            "reference_number",
+            "key_dates",
+            "action_required"
+        ],
+        .receipt: ["merchant", "date", "time", "total", "subtotal", "tax", "payment_method", "last_four", "transaction_id", "items"],
+        .promotional: [
+            "offer_description",
+            "promo_code",
+            "offer_amount",
+            "requirements",
+            "expiration_date",
+            "company",
+            "phone_number",
+            "website",
+            "terms"
+        ]
+    ]
 }
 
 // MARK: - OpenAI LLM Service
 
+/// Instructions shared by the OpenAI and on-device text cleanup requests.
+private let ocrCleanupInstructions = """
+Clean up the following OCR-extracted text to make it more readable.
+Fix any obvious OCR errors, normalize spacing and line breaks,
+and format it in a clear, readable way.
+Preserve all important information but make it easier to read.
+Do not translate or summarize - just clean up the formatting and obvious errors.
+
+Return ONLY the cleaned text, without any explanations or additional commentary.
+"""
+
 /// OpenAI-based LLM service for field extraction
 final class OpenAILLMService: LLMService {
+    private static let endpoint = URL(string: "https://api.openai.com/v1/chat/completions")!
+    private static let cleanTextSystemMessage = ["role": "system", "content": ocrCleanupInstructions]
+
     private let apiKey: String
     private let model: String
 
@@ -1076,73 +1219,38 @@ final class OpenAILLMService: LLMService {
     }
 
     func extract(prompt: String, text: String) async throws -> String {
-        let url = URL(string: "https://api.openai.com/v1/chat/completions")!
-        var request = URLRequest(url: url)
-        request.httpMethod = "POST"
-        request.setValue("Bearer \(apiKey)", forHTTPHeaderField: "Authorization")
-        request.setValue("application/json", forHTTPHeaderField: "Content-Type")
-
         let messages = [
             ["role": "system", "content": prompt],
             ["role": "user", "content": "Document text:\n\n\(text)"]
         ]
+        return try await complete(messages: messages, maxTokens: 500, jsonMode: true)
+    }
 
-        let body: [String: Any] = [
-            "model": model,
-            "messages": messages,
-            "temperature": 0.1,
-            "max_tokens": 500,
-            "response_format": ["type": "json_object"]
+    func cleanText(_ rawText: String) async throws -> String {
+        let messages = [
+            Self.cleanTextSystemMessage,
+            ["role": "user", "content": rawText]
         ]
-
-        request.httpBody = try JSONSerialization.data(withJSONObject: body)
-
-        let (data, response) = try await URLSession.shared.data(for: request)
-
-        guard let httpResponse = response as? HTTPURLResponse,
-              httpResponse.statusCode == 200 else {
-            throw NSError(domain: "OpenAI", code: -1, userInfo: [NSLocalizedDescriptionKey: "API request failed"])
-        }
-
-        guard let json = try JSONSerialization.jsonObject(with: data) as? [String: Any],
-              let choices = json["choices"] as? [[String: Any]],
-              let firstChoice = choices.first,
-              let message = firstChoice["message"] as? [String: Any],
-              let content = message["content"] as? String else {
-            throw NSError(domain: "OpenAI", code: -1, userInfo: [NSLocalizedDescriptionKey: "Invalid response format"])
-        }
-
-        return content
+        let content = try await complete(messages: messages, maxTokens: 2000, jsonMode: false)
+        return content.trimmingCharacters(in: .whitespacesAndNewlines)
     }
 
-    func cleanText(_ rawText: String) async throws -> String {
-        let url = URL(string: "https://api.openai.com/v1/chat/completions")!
-        var request = URLRequest(url: url)
+    /// Sends one chat completion request and returns the first choice's message content.
+    private func complete(messages: [[String: String]], maxTokens: Int, jsonMode: Bool) async throws -> String {
+        var request = URLRequest(url: Self.endpoint)
         request.httpMethod = "POST"
         request.setValue("Bearer \(apiKey)", forHTTPHeaderField: "Authorization")
         request.setValue("application/json", forHTTPHeaderField: "Content-Type")
 
-        let prompt = """
-        Clean up the following OCR-extracted text to make it more readable.
-        Fix any obvious OCR errors, normalize spacing and line breaks,
-        and format it in a clear, readable way.
-        Preserve all important information but make it easier to read.
-        Do not translate or summarize - just clean up the formatting and obvious errors.
-
-        Return ONLY the cleaned text, without any explanations or additional commentary.
-        """
-
-        let messages = [
-            ["role": "system", "content": prompt],
-            ["role": "user", "content": rawText]
-        ]
-
-        let body: [String: Any] = [
+        var body: [String: Any] = [
             "model": model,
             "messages": messages,
             "temperature": 0.1,
-            "max_tokens": 2000
+            "max_tokens": maxTokens
         ]
+        if jsonMode {
+            body["response_format"] = ["type": "json_object"]
+        }
 
         request.httpBody = try JSONSerialization.data(withJSONObject: body)
 
@@ -1161,7 +1269,7 @@ final class OpenAILLMService: LLMService {
             throw NSError(domain: "OpenAI", code: -1, userInfo: [NSLocalizedDescriptionKey: "Invalid response format"])
         }
 
-        return content.trimmingCharacters(in: .whitespacesAndNewlines)
+        return content
     }
 }
 
@@ -1239,13 +1347,7 @@ final class AppleLLMService: LLMService {
 
         // Construct the cleanup prompt
         let prompt = """
-        Clean up the following OCR-extracted text to make it more readable.
-        Fix any obvious OCR errors, normalize spacing and line breaks,
-        and format it in a clear, readable way.
-        Preserve all important information but make it easier to read.
-        Do not translate or summarize - just clean up the formatting and obvious errors.
-
-        Return ONLY the cleaned text, without any explanations or additional commentary.
+        \(ocrCleanupInstructions)
 
         Text to clean:
         \(rawText)
@@ -1278,19 +1380,42 @@ final class LLMServiceFactory {
         case none         // Disable LLM extraction
     }
 
+    // Services are created once per configuration and reused; the factory is main-actor
+    // isolated, so the caches need no further synchronization.
+    private static var openAIServices: [String: OpenAILLMService] = [:]
+    #if canImport(FoundationModels)
+    /// Typed as `Any` because stored properties can't carry an availability annotation.
+    private static var cachedAppleService: Any?
+
+    @available(iOS 18.2, *)
+    private static func appleService() -> AppleLLMService {
+        if let service = cachedAppleService as? AppleLLMService {
+            return service
+        }
+        let service = AppleLLMService()
+        cachedAppleService = service
+        return service
+    }
+    #endif
+
     static func create(type: ServiceType) -> LLMService? {
         switch type {
         case .apple:
             #if canImport(FoundationModels)
             if #available(iOS 18.2, *) {
-                let service = AppleLLMService()
+                let service = appleService()
                 return service.isAvailable ? service : nil
             }
             #endif
             return nil
 
         case .openai(let apiKey):
-            return OpenAILLMService(apiKey: apiKey)
+            if let service = openAIServices[apiKey] {
+                return service
+            }
+            let service = OpenAILLMService(apiKey: apiKey)
+            openAIServices[apiKey] = service
+            return service
 
         case .none:
             return nil
@@ -1300,8 +1425,7 @@ final class LLMServiceFactory {
     static func checkAppleIntelligenceAvailability() -> Bool {
         #if canImport(FoundationModels)
         if #available(iOS 18.2, *) {
-            let service = AppleLLMService()
-            return service.isAvailable
+            return appleService().isAvailable
         }
         #endif
         return false
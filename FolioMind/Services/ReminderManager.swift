@@ -299,31 +299,31 @@ final class ReminderManager {
 
     // MARK: - Helper Methods
 
+    /// Date formats tried in order when parsing field values; built once and reused. The POSIX locale
+    /// keeps fixed formats (and English month names) independent of the user's language and calendar.
+    private static let parsingFormatters: [DateFormatter] = ["MM/dd/yyyy", "MM/dd/yy", "MMM dd, yyyy", "MMMM dd, yyyy"]
+        .map { format in
+            let formatter = DateFormatter()
+            formatter.locale = Locale(identifier: "en_US_POSIX")
+            formatter.dateFormat = format
+            return formatter
+        }
+
+    /// A formatter keeps the locale it was created with, and the app language can change without a
+    /// relaunch, so this is rebuilt whenever `LanguageManager` reports a different language.
+    private static var displayFormatter = makeDisplayFormatter()
+    private static var displayFormatterLanguage = LanguageManager.shared.currentLanguage
+
+    private static func makeDisplayFormatter() -> DateFormatter {
+        let formatter = DateFormatter()
+        formatter.locale = LanguageManager.shared.locale
+        formatter.dateStyle = .medium
+        formatter.timeStyle = .none
+        return formatter
+    }
+
     private func parseDate(from string: String) -> Date? {
-        let formatters: [DateFormatter] = [
-            {
-                let formatter = DateFormatter()
-                formatter.dateFormat = "MM/dd/yyyy"
-                return formatter
-            }(),
-            {
-                let formatter = DateFormatter()
-                formatter.dateFormat = "MM/dd/yy"
-                return formatter
-            }(),
-            {
-                let formatter = DateFormatter()
-                formatter.dateFormat = "MMM dd, yyyy"
-                return formatter
-            }(),
-            {
-                let formatter = DateFormatter()
-                formatter.dateFormat = "MMMM dd, yyyy"
-                return formatter
-            }()
-        ]
-
-        for formatter in formatters {
+        for formatter in Self.parsingFormatters {
             if let date = formatter.date(from: string) {
                 return date
             }
@@ -333,10 +333,12 @@ final class ReminderManager {
     }
 
     private func formatDate(_ date: Date) -> String {
-        let formatter = DateFormatter()
-        formatter.dateStyle = .medium
-        formatter.timeStyle = .none
-        return formatter.string(from: date)
+        let language = LanguageManager.shared.currentLanguage
+        if language != Self.displayFormatterLanguage {
+            Self.displayFormatter = Self.makeDisplayFormatter()
+            Self.displayFormatterLanguage = language
+        }
+        return Self.displayFormatter.string(from: date)
     }
 }
 
@@ -54,14 +54,16 @@ struct VisionDocumentAnalyzer: DocumentAnalyzer {
     }
 
     func analyze(imageURL: URL, hints: DocumentHints?) async throws -> DocumentAnalysisResult {
+        // Face detection is independent of OCR and extraction; run it alongside them
+        async let detectedFaces = VisionFaceDetector().detectFaces(at: imageURL)
+
         let rawText = try await ocrSource.recognizeText(at: imageURL)
         let cleanedText = await cleanIfPossible(rawText)
         let localText = cleanedText ?? rawText
-        let faces = try await VisionFaceDetector().detectFaces(at: imageURL)
 
         // Classify document type first (for intelligent extraction)
         let patternFields = FieldExtractor.extractFields(from: localText)
-        let preliminaryType = DocumentTypeClassifier.classify(
+        let preliminaryType = await DocumentTypeClassifier.classifyInBackground(
             ocrText: localText,
             fields: patternFields,
             hinted: hints?.suggestedType,
@@ -72,31 +74,40 @@ struct VisionDocumentAnalyzer: DocumentAnalyzer {
         var extractedFields = patternFields
         if let intelligentExtractor = intelligentExtractor {
             do {
+#if DEBUG
                 print("🧠 Running intelligent field extraction for \(preliminaryType.displayName)...")
+#endif
                 let intelligentFields = try await intelligentExtractor.extractFields(
                     from: localText,
                     docType: preliminaryType
                 )
-                print("✅ Intelligent extraction found \(intelligentFields.count) fields")
                 // Merge pattern-based and LLM-based fields
                 extractedFields = mergeFields(pattern: patternFields, intelligent: intelligentFields)
+#if DEBUG
+                print("✅ Intelligent extraction found \(intelligentFields.count) fields")
                 print("📊 Total fields after merge: \(extractedFields.count)")
+#endif
             } catch {
                 // Fall back to pattern-based fields if intelligent extraction fails
+#if DEBUG
                 print("⚠️ Intelligent extraction failed: \(error)")
                 print("📝 Using pattern-based fields only (\(patternFields.count) fields)")
+#endif
             }
         } else {
+#if DEBUG
             print("ℹ️ Intelligent extractor not configured, using pattern-based extraction only")
+#endif
         }
 
-        let classifiedLocalType = DocumentTypeClassifier.classify(
+        let classifiedLocalType = await DocumentTypeClassifier.classifyInBackground(
             ocrText: localText,
             fields: extractedFields,
             hinted: hints?.suggestedType,
             defaultType: preliminaryType
         )
 
+        let faces = try await detectedFaces
         let localResult = DocumentAnalysisResult(
             ocrText: localText,
             fields: extractedFields,
@@ -180,7 +191,9 @@ struct VisionDocumentAnalyzer: DocumentAnalyzer {
         do {
             return try await llmService.cleanText(text)
         } catch {
+#if DEBUG
             print("Text cleaning with LLM failed: \(error.localizedDescription)")
+#endif
             return nil
         }
     }
@@ -1372,9 +1372,12 @@ struct DocumentDetailPageView: View {
         for url in urls {
             _ = await ImagePreprocessor.processFileInPlace(url)
             do {
-                let data = try Data(contentsOf: url)
                 let isPersisted = assetsDirectory.map { url.deletingLastPathComponent() == $0 } ?? false
                 let destinationURL = isPersisted ? url : nil
+                // Persisted files are registered in place; only staged files are read, and off the main actor
+                let data = isPersisted ? Data() : try await Task.detached(priority: .userInitiated) {
+                    try Data(contentsOf: url)
+                }.value
 
                 if await addAsset(from: data, preprocessed: true, existingURL: destinationURL) {
                     addedCount += 1
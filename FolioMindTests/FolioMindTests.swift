@@ -40,6 +40,18 @@ struct MockDocumentAnalyzer: DocumentAnalyzer {
     }
 }
 
+/// Uses each page file's contents as its OCR text, and delays the first page so it finishes last.
+@MainActor
+struct OutOfOrderPageAnalyzer: DocumentAnalyzer {
+    func analyze(imageURL: URL, hints: DocumentHints?) async throws -> DocumentAnalysisResult {
+        let pageText = try String(contentsOf: imageURL, encoding: .utf8)
+        if pageText == "page1" {
+            try await Task.sleep(nanoseconds: 200_000_000)
+        }
+        return DocumentAnalysisResult(ocrText: pageText, fields: [], docType: .generic, faceClusters: [])
+    }
+}
+
 @MainActor
 final class MockSearchEngine: SearchEngine {
     private let modelContext: ModelContext
@@ -77,6 +89,27 @@ struct MockMetadataExtractor: ImageMetadataExtracting {
     }
 }
 
+/// Returns queued replies in order (repeating the last one) and counts `extract` calls.
+final class CountingLLMService: LLMService {
+    let followsPrompt: Bool
+    private var replies: [String]
+    private(set) var extractCallCount = 0
+
+    init(replies: [String] = ["{}"], followsPrompt: Bool = true) {
+        self.replies = replies
+        self.followsPrompt = followsPrompt
+    }
+
+    func extract(prompt: String, text: String) async throws -> String {
+        extractCallCount += 1
+        return replies.count > 1 ? replies.removeFirst() : replies[0]
+    }
+
+    func cleanText(_ rawText: String) async throws -> String {
+        rawText
+    }
+}
+
 struct FolioMindTests {
 
     @Test func documentDefaults() {
@@ -287,6 +320,44 @@ struct FolioMindTests {
         #expect(doc.ocrText.contains("page2"))
     }
 
+    @MainActor
+    @Test func ingestDocumentsKeepsPageOrderWhenPagesFinishOutOfOrder() async throws {
+        let schema = Schema([
+            Document.self,
+            Asset.self,
+            Person.self,
+            Field.self,
+            FaceCluster.self,
+            Embedding.self,
+            DocumentPersonLink.self,
+            DocumentReminder.self,
+            AudioNote.self
+        ])
+        let configuration = ModelConfiguration(schema: schema, isStoredInMemoryOnly: true)
+        let container = try ModelContainer(for: schema, configurations: [configuration])
+        let context = ModelContext(container)
+
+        let directory = FileManager.default.temporaryDirectory
+        let urls = try ["page1", "page2"].map { page in
+            let url = directory.appendingPathComponent("\(UUID().uuidString).png")
+            try Data(page.utf8).write(to: url)
+            return url
+        }
+        defer { urls.forEach { try? FileManager.default.removeItem(at: $0) } }
+
+        let store = DocumentStore(
+            analyzer: OutOfOrderPageAnalyzer(),
+            embeddingService: SimpleEmbeddingService()
+        )
+        let doc = try await store.ingestDocuments(
+            from: urls,
+            options: DocumentStore.DocumentIngestOptions(title: "Ordered Doc"),
+            in: context
+        )
+
+        #expect(doc.ocrText == "page1\n\npage2")
+    }
+
     @MainActor
     @Test func ingestDocumentsAppliesMetadataLocationAndCaptureDate() async throws {
         let schema = Schema([
@@ -364,6 +435,26 @@ struct FolioMindTests {
         #expect(result == .creditCard)
     }
 
+    @Test func keywordMatcherReportsOverlappingGroups() {
+        let matcher = KeywordMatcher<String>([
+            "due": ["amount due", "due"],
+            "amount": ["amount"],
+            "suffix": ["unt d"],
+            "missing": ["invoice"]
+        ])
+        let hits = matcher.matches(in: "total amount due: $12")
+        #expect(hits == ["due", "amount", "suffix"])
+        #expect(matcher.matches(in: "").isEmpty)
+        #expect(matcher.matchesAny(in: "an invoice"))
+        #expect(!matcher.matchesAny(in: "total: $12"))
+    }
+
+    @Test func keywordMatcherFoldsCaseWhenRequested() {
+        let matcher = KeywordMatcher<String>(["issuer": ["wells fargo"]], caseInsensitive: true)
+        #expect(matcher.matches(in: "WELLS FARGO Debit") == ["issuer"])
+        #expect(KeywordMatcher<String>(["issuer": ["wells fargo"]]).matches(in: "WELLS FARGO").isEmpty)
+    }
+
     @Test func cardDetailsExtractorFindsPanAndExpiry() {
         let text = """
         bofa.com/globalcardaccess
@@ -725,6 +816,30 @@ struct FolioMindTests {
         #expect(phoneFields.count >= 1)
     }
 
+    @Test func fieldExtractorExtractsFormattedUSPhoneNumber() {
+        let fields = FieldExtractor.extractFields(from: "Call (555) 123-4567 for support")
+
+        #expect(fields.contains { $0.key == "phone_number" && $0.value == "(555) 123-4567" })
+    }
+
+    @Test func fieldExtractorExtractsInternationalPhoneNumber() {
+        let fields = FieldExtractor.extractFields(from: "Phone: +44 20 1234 5678")
+
+        #expect(fields.contains { $0.key == "phone_number" && $0.value == "+44 20 1234 5678" })
+    }
+
+    @Test func fieldExtractorExtractsCompactPhoneNumber() {
+        let fields = FieldExtractor.extractFields(from: "Tel 5551234567")
+
+        #expect(fields.contains { $0.key == "phone_number" && $0.value == "5551234567" })
+    }
+
+    @Test func fieldExtractorIgnoresReceiptDateAndTotalLine() {
+        let fields = FieldExtractor.extractFields(from: "01/15/2025 14:32 TOTAL $15.69")
+
+        #expect(!fields.contains { $0.key == "phone_number" })
+    }
+
     @Test func fieldExtractorExtractsEmails() {
         let text = "Email: support@example.com or contact@test.org"
         let fields = FieldExtractor.extractFields(from: text)
@@ -783,6 +898,79 @@ struct FolioMindTests {
         #expect(result == .receipt)
     }
 
+    @MainActor
+    @Test func intelligentExtractorCallsLLMForInsuranceEvenWhenPatternsFindIdentity() async throws {
+        let text = """
+        Aetna
+        Dental PPO
+        Member ID W123456
+        Group: 87654321
+        01 JAY ZENG
+        RxBIN 610014
+        """
+        let service = CountingLLMService(replies: [#"{"rx_bin": "610014"}"#])
+        let extractor = IntelligentFieldExtractor(llmService: service, useNaturalLanguage: false)
+
+        let fields = try await extractor.extractFields(from: text, docType: .insuranceCard)
+
+        #expect(service.extractCallCount == 1)
+        #expect(fields.contains { $0.key == "member_id" && $0.value == "W123456" })
+        #expect(fields.contains { $0.key == "rx_bin" && $0.value == "610014" })
+    }
+
+    @MainActor
+    @Test func intelligentExtractorCallsLLMForReceiptsEvenWithPatternHits() async throws {
+        let text = """
+        Store #001234
+        Total $15.69
+        Date 01/15/2025
+        """
+        let service = CountingLLMService(replies: [#"{"merchant": "City Market"}"#])
+        let extractor = IntelligentFieldExtractor(llmService: service, useNaturalLanguage: false)
+
+        let fields = try await extractor.extractFields(from: text, docType: .receipt)
+
+        #expect(service.extractCallCount == 1)
+        #expect(fields.contains { $0.key == "merchant" && $0.value == "City Market" })
+    }
+
+    @MainActor
+    @Test func intelligentExtractorRetriesMalformedReplyOnce() async throws {
+        let service = CountingLLMService(replies: ["not json", "still not json", #"{"merchant": "City Market"}"#])
+        let extractor = IntelligentFieldExtractor(llmService: service, useNaturalLanguage: false)
+
+        let fields = try await extractor.extractFields(from: "City Market\nTotal $15.69", docType: .receipt)
+
+        #expect(service.extractCallCount == 2)
+        #expect(!fields.contains { $0.key == "merchant" })
+    }
+
+    @MainActor
+    @Test func intelligentExtractorParsesFencedReplyWithoutRetry() async throws {
+        let fenced = """
+        ```json
+        {"merchant": "City Market"}
+        ```
+        """
+        let service = CountingLLMService(replies: [fenced])
+        let extractor = IntelligentFieldExtractor(llmService: service, useNaturalLanguage: false)
+
+        let fields = try await extractor.extractFields(from: "City Market\nTotal $15.69", docType: .receipt)
+
+        #expect(service.extractCallCount == 1)
+        #expect(fields.contains { $0.key == "merchant" && $0.value == "City Market" })
+    }
+
+    @MainActor
+    @Test func intelligentExtractorDoesNotRetryServicesThatIgnoreThePrompt() async throws {
+        let service = CountingLLMService(replies: ["not json"], followsPrompt: false)
+        let extractor = IntelligentFieldExtractor(llmService: service, useNaturalLanguage: false)
+
+        _ = try await extractor.extractFields(from: "City Market\nTotal $15.69", docType: .receipt)
+
+        #expect(service.extractCallCount == 1)
+    }
+
     @Test func assetTypeHasIcons() {
         #expect(AssetType.image.icon == "photo")
         #expect(AssetType.pdf.icon == "doc.text")